@@ -1,11 +1,16 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from backstage_automation import BackstageAutomation
 from secure_storage import SecureStorage
+from webhook_receiver import RepoStatusStore, start_webhook_server
 import os
 import time
-from typing import Dict, List
-import random
+import atexit
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 # Page configuration
 st.set_page_config(
@@ -14,8 +19,42 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def get_storage() -> SecureStorage:
+    """Return a shared SecureStorage instance so the cipher is built once."""
+    return SecureStorage()
+
 # Initialize secure storage
-storage = SecureStorage()
+storage = get_storage()
+
+@st.cache_resource
+def get_webhook_store() -> Optional[RepoStatusStore]:
+    """Start the webhook receiver once when BACKSTAGE_WEBHOOK_SECRET is set."""
+    secret = os.environ.get("BACKSTAGE_WEBHOOK_SECRET")
+    if not secret:
+        return None
+    store = RepoStatusStore()
+    port = int(os.environ.get("BACKSTAGE_WEBHOOK_PORT", "8765"))
+    try:
+        start_webhook_server(store, secret, port=port)
+    except OSError as e:
+        # e.g. another Streamlit process already owns the port; fall back to polling GitHub
+        st.warning(f"Webhook receiver disabled: could not listen on port {port}: {str(e)}")
+        return None
+    return store
+
+# Repository status pushed by GitHub webhooks (None when webhooks are disabled)
+webhook_store = get_webhook_store()
+
+@st.cache_data(ttl=60)
+def _list_orgs() -> List[str]:
+    """Cached list of configured organizations."""
+    return storage.list_organizations()
+
+@st.cache_data(ttl=60)
+def _load_cfg(org_name: str) -> Dict:
+    """Cached, decrypted configuration for an organization."""
+    return storage.load_org_config(org_name)
 
 # Demo data for test organization
 DEMO_REPOS = [
@@ -29,80 +68,236 @@ DEMO_REPOS = [
     {"name": "monitoring-tools", "language": "Go", "status": "In Progress"}
 ]
 
+# Fixed category order keeps Status codes stable across rebuilds
+STATUS_CATEGORIES = ["Onboarded", "In Progress", "Not Onboarded", "Failed"]
+
+def with_categorical_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Store the low-cardinality Status and Language columns as categoricals."""
+    if df.empty:
+        return df
+    # Per-repository "Error: ..." statuses are appended as extra categories
+    extra = sorted(set(df["Status"]) - set(STATUS_CATEGORIES))
+    return df.astype({
+        "Status": pd.CategoricalDtype(STATUS_CATEGORIES + extra),
+        "Language": "category"
+    })
+
+# PR status shown for each demo onboarding status
+DEMO_PR_STATUS = {"Onboarded": "Merged", "In Progress": "PR #123 Open"}
+
+@st.cache_resource
+def _build_demo_static() -> pd.DataFrame:
+    """Build the demo columns that do not change between reruns.
+
+    Cached because Streamlit re-executes the script body on every rerun;
+    callers must not modify the returned DataFrame in place.
+    """
+    statuses = [repo["status"] for repo in DEMO_REPOS]
+    return with_categorical_columns(pd.DataFrame({
+        "Repository": [repo["name"] for repo in DEMO_REPOS],
+        "Language": [repo["language"] for repo in DEMO_REPOS],
+        "Status": statuses,
+        "Has catalog-info.yaml": ["Yes" if status == "Onboarded" else "No" for status in statuses],
+        "PR Status": [DEMO_PR_STATUS.get(status, "N/A") for status in statuses]
+    }))
+
+_DEMO_DF_STATIC = _build_demo_static()
+
 def get_demo_data():
     """Generate demo repository data with realistic statistics."""
-    data = []
-    for repo in DEMO_REPOS:
-        status_details = {
-            "Repository": repo["name"],
-            "Language": repo["language"],
-            "Status": repo["status"],
-            "Has catalog-info.yaml": "Yes" if repo["status"] == "Onboarded" else "No",
-            "PR Status": "Merged" if repo["status"] == "Onboarded" else 
-                        "PR #123 Open" if repo["status"] == "In Progress" else
-                        "N/A",
-            "Last Updated": f"{random.randint(1, 30)} days ago"
-        }
-        data.append(status_details)
-    return pd.DataFrame(data)
-
-def init_automation(github_token: str, org_name: str, backstage_url: str, github_api_url: str = None) -> BackstageAutomation:
+    days = np.random.randint(1, 31, size=len(_DEMO_DF_STATIC))
+    return _DEMO_DF_STATIC.assign(**{"Last Updated": [f"{day} days ago" for day in days]})
+
+@st.cache_resource
+def _create_automation(github_token: str, org_name: str, github_api_url: str = None,
+                       github_tokens: Tuple[str, ...] = ()) -> BackstageAutomation:
+    """Create a BackstageAutomation instance shared across reruns and sessions."""
+    automation = BackstageAutomation(github_token, org_name, github_api_url, list(github_tokens))
+    # The instance lives as long as the server, so persist its ETag cache on shutdown
+    atexit.register(automation.etag_cache.save)
+    return automation
+
+def init_automation(github_token: str, org_name: str, backstage_url: str, github_api_url: str = None,
+                    github_tokens: List[str] = None) -> BackstageAutomation:
     """Initialize the BackstageAutomation class with provided credentials."""
     try:
-        return BackstageAutomation(github_token, org_name, github_api_url)
+        return _create_automation(github_token, org_name, github_api_url, tuple(github_tokens or ()))
     except Exception as e:
         st.error(f"Failed to initialize automation: {str(e)}")
         return None
 
+def _inspect_one_repo(automation: BackstageAutomation, repo, status: Dict, open_prs: Dict[str, int]) -> Dict:
+    """Fill in the onboarding columns of a repository's status row."""
+    
+    try:
+        # Check if catalog-info.yaml exists using the root tree listing
+        if "catalog-info.yaml" in automation.get_root_tree_paths(repo):
+            status["Has catalog-info.yaml"] = "Yes"
+            status["Status"] = "Onboarded"
+        
+        # Check for open PRs related to Backstage
+        repo_name = status["Repository"]
+        if repo_name in open_prs:
+            status["Status"] = "In Progress"
+            status["PR Status"] = f"PR #{open_prs[repo_name]} Open"
+        
+    except Exception as e:
+        status["Status"] = f"Error: {str(e)}"
+    
+    return status
+
 def get_repo_status(automation: BackstageAutomation) -> List[Dict]:
     """Get the status of all repositories in the organization."""
     repos_status = []
     
     try:
-        repositories = automation.org.get_repos()
-        for repo in repositories:
+        for summary in automation.get_org_repo_summaries():
             status = {
-                "Repository": repo.name,
-                "Language": repo.language or "Unknown",
+                "Repository": summary["name"],
+                "Language": summary["language"] or "Unknown",
                 "Status": "Not Onboarded",
                 "Has catalog-info.yaml": "No",
                 "PR Status": "N/A",
-                "Last Updated": repo.updated_at.strftime("%Y-%m-%d")
+                "Last Updated": summary["updated_at"].strftime("%Y-%m-%d")
             }
-            
-            try:
-                # Check if catalog-info.yaml exists
-                try:
-                    repo.get_contents("catalog-info.yaml")
-                    status["Has catalog-info.yaml"] = "Yes"
-                    status["Status"] = "Onboarded"
-                except Exception:
-                    pass
-                
-                # Check for open PRs related to Backstage
-                open_prs = repo.get_pulls(state='open')
-                for pr in open_prs:
-                    if "backstage-integration" in pr.head.ref:
-                        status["Status"] = "In Progress"
-                        status["PR Status"] = f"PR #{pr.number} Open"
-                        break
-                
-            except Exception as e:
-                status["Status"] = f"Error: {str(e)}"
-            
+            if summary["has_catalog"]:
+                status["Has catalog-info.yaml"] = "Yes"
+                status["Status"] = "Onboarded"
+            if summary["backstage_pr"] is not None:
+                status["Status"] = "In Progress"
+                status["PR Status"] = f"PR #{summary['backstage_pr']} Open"
             repos_status.append(status)
+        return repos_status
+    except Exception as e:
+        # Fall back to per-repository REST calls if GraphQL is unavailable
+        print(f"GraphQL status query failed, falling back to REST: {str(e)}")
+        st.warning(f"GraphQL status query failed, falling back to slower REST calls: {str(e)}")
+        repos_status = []
+    
+    try:
+        # Finish pagination and read the listing attributes up front so the
+        # workers only make the per-repository calls
+        repos = list(automation.org.get_repos())
+        rows = [{
+            "Repository": repo.name,
+            "Language": repo.language or "Unknown",
+            "Status": "Not Onboarded",
+            "Has catalog-info.yaml": "No",
+            "PR Status": "N/A",
+            "Last Updated": repo.updated_at.strftime("%Y-%m-%d")
+        } for repo in repos]
+        open_prs = automation.throttled(automation.get_open_backstage_prs)
+        # Capped at 8 workers to stay within GitHub's secondary rate limits
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            repos_status = list(executor.map(
+                lambda repo, status: automation.throttled(_inspect_one_repo, automation, repo, status, open_prs),
+                repos,
+                rows
+            ))
     
     except Exception as e:
         st.error(f"Failed to fetch repositories: {str(e)}")
     
     return repos_status
 
+def _onboard_one_repo(automation: BackstageAutomation, repo_name: str):
+    """Create the onboarding PR and issue, returning the exception on failure."""
+    try:
+        return automation.throttled(automation.create_pr_and_issue, repo_name)
+    except Exception as e:
+        return e
+
+def bulk_onboard(automation: BackstageAutomation, repo_names: List[str]) -> List[Tuple[str, object]]:
+    """Onboard several repositories concurrently.
+
+    Results are returned in input order as (repo_name, (pr, issue) or exception)
+    so they can be reported from the main Streamlit thread.
+    """
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = executor.map(lambda name: _onboard_one_repo(automation, name), repo_names)
+        return list(zip(repo_names, results))
+
+# Repository status snapshots kept on disk so a restart doesn't force a full re-fetch
+STATUS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+STATUS_CACHE_TTL = 3600  # seconds
+
+def _status_snapshot_path(org_name: str) -> str:
+    """Path of the on-disk status snapshot for an organization."""
+    return os.path.join(STATUS_CACHE_DIR, org_name, "repos.json")
+
+def _load_status_snapshot(org_name: str, token_hash: str) -> Optional[List[Dict]]:
+    """Load a fresh status snapshot written with the same token, if one exists."""
+    try:
+        with open(_status_snapshot_path(org_name), "r") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get("token_hash") != token_hash:
+        return None
+    if time.time() - snapshot.get("fetched_at", 0) > STATUS_CACHE_TTL:
+        return None
+    return snapshot["repos"]
+
+def _save_status_snapshot(org_name: str, token_hash: str, repos_status: List[Dict]):
+    """Atomically write the status snapshot for an organization."""
+    file_path = _status_snapshot_path(org_name)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"token_hash": token_hash, "fetched_at": time.time(), "repos": repos_status}, f)
+    os.replace(tmp_path, file_path)
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner="Refreshing repos...")
+def _fetch_repo_status(org_name: str, token_hash: str, _automation: BackstageAutomation) -> List[Dict]:
+    """Cached wrapper around get_repo_status, keyed on organization and token hash."""
+    repos_status = _load_status_snapshot(org_name, token_hash)
+    if repos_status is None:
+        repos_status = get_repo_status(_automation)
+        if repos_status:  # Don't persist a failed fetch
+            _save_status_snapshot(org_name, token_hash, repos_status)
+    return repos_status
+
+def clear_repo_status(org_name: str):
+    """Drop every cached copy of an organization's repository status."""
+    _fetch_repo_status.clear()
+    st.session_state[f"df_{org_name}_stale"] = True
+    if webhook_store:
+        webhook_store.forget(org_name)
+    try:
+        os.remove(_status_snapshot_path(org_name))
+    except FileNotFoundError:
+        pass
+
+def _hash_token(github_token: str) -> str:
+    """Hash a GitHub token so it can be used as a cache key without storing it."""
+    return hashlib.sha256(github_token.encode()).hexdigest()
+
+@st.cache_resource
+def _repo_table_column_config() -> Dict:
+    """Column configuration for the repository table, built once per process.
+
+    The script body reruns on every interaction, so a plain module-level
+    constant would be rebuilt each time.
+    """
+    return {
+        "Repository": st.column_config.TextColumn("Repository"),
+        "Language": st.column_config.TextColumn("Language"),
+        "Status": st.column_config.TextColumn(
+            "Status",
+            help="Current onboarding status"
+        ),
+        "Has catalog-info.yaml": st.column_config.TextColumn("Has catalog-info.yaml"),
+        "PR Status": st.column_config.TextColumn("PR Status"),
+        "Last Updated": st.column_config.TextColumn("Last Updated")
+    }
+
 def render_org_dashboard(org_name: str, is_demo: bool = False):
     """Render the dashboard for a specific organization."""
     if is_demo:
         df = get_demo_data()
+        automation = None
     else:
-        config = storage.load_org_config(org_name)
+        config = _load_cfg(org_name)
         if not config:
             st.error(f"No configuration found for {org_name}")
             return
@@ -111,68 +306,91 @@ def render_org_dashboard(org_name: str, is_demo: bool = False):
             config["github_token"],
             org_name,
             config["backstage_url"],
-            config.get("github_api_url")
+            config.get("github_api_url"),
+            config.get("github_tokens")
         )
         
         if not automation:
             return
         
-        repos_status = get_repo_status(automation)
-        df = pd.DataFrame(repos_status)
+        if st.button("Refresh", key=f"refresh_{org_name}"):
+            clear_repo_status(org_name)
+        
+        # Reuse this session's DataFrame until it is refreshed or a webhook changes it
+        key = f"df_{org_name}"
+        version = webhook_store.version(org_name) if webhook_store else None
+        if (key not in st.session_state
+                or st.session_state.get(f"{key}_stale")
+                or st.session_state.get(f"{key}_version") != version):
+            # Webhook events keep the store current; only fetch from GitHub on a cold start
+            repos_status = webhook_store.get(org_name) if webhook_store else None
+            if repos_status is None:
+                repos_status = _fetch_repo_status(org_name, _hash_token(config["github_token"]), automation)
+                if webhook_store and repos_status:  # Don't share a failed fetch with every session
+                    webhook_store.seed(org_name, repos_status)
+            st.session_state[key] = with_categorical_columns(pd.DataFrame(repos_status))
+            st.session_state[f"{key}_stale"] = False
+            st.session_state[f"{key}_version"] = webhook_store.version(org_name) if webhook_store else None
+        df = st.session_state[key]
     
     # Display statistics
+    status_counts = df["Status"].value_counts()
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric("Total Repositories", len(df))
     with col2:
-        onboarded = len(df[df["Status"] == "Onboarded"])
-        st.metric("Onboarded", onboarded)
+        st.metric("Onboarded", int(status_counts.get("Onboarded", 0)))
     with col3:
-        in_progress = len(df[df["Status"] == "In Progress"])
-        st.metric("In Progress", in_progress)
+        st.metric("In Progress", int(status_counts.get("In Progress", 0)))
     with col4:
-        not_onboarded = len(df[df["Status"] == "Not Onboarded"])
-        st.metric("Not Onboarded", not_onboarded)
+        st.metric("Not Onboarded", int(status_counts.get("Not Onboarded", 0)))
     
     # Display repository table
     st.dataframe(
         df,
-        column_config={
-            "Repository": st.column_config.TextColumn("Repository"),
-            "Language": st.column_config.TextColumn("Language"),
-            "Status": st.column_config.TextColumn(
-                "Status",
-                help="Current onboarding status"
-            ),
-            "Has catalog-info.yaml": st.column_config.TextColumn("Has catalog-info.yaml"),
-            "PR Status": st.column_config.TextColumn("PR Status"),
-            "Last Updated": st.column_config.TextColumn("Last Updated")
-        },
+        column_config=_repo_table_column_config(),
         hide_index=True
     )
     
+    # Outcome of the last onboarding run, kept across the rerun it triggered
+    for level, message in st.session_state.pop(f"onboard_results_{org_name}", []):
+        getattr(st, level)(message)
+    
     # Repository selection for onboarding
-    not_onboarded = df[df["Status"] == "Not Onboarded"]["Repository"].tolist()
+    not_onboarded = df.loc[df["Status"].eq("Not Onboarded"), "Repository"].tolist()
     if not_onboarded:
-        st.subheader("Onboard New Repositories")
-        selected_repos = st.multiselect(
-            "Select repositories to onboard",
-            options=not_onboarded
-        )
-        
-        if st.button("Start Onboarding"):
-            if selected_repos:
-                if not is_demo:
-                    for repo_name in selected_repos:
-                        try:
-                            pr, issue = automation.create_pr_and_issue(repo_name)
-                            st.success(f"Created PR #{pr.number} for {repo_name}")
-                        except Exception as e:
-                            st.error(f"Failed to onboard {repo_name}: {str(e)}")
-                else:
-                    st.info("Demo mode: Onboarding simulation successful!")
+        _onboarding_panel(org_name, not_onboarded, automation, is_demo)
+
+@st.fragment
+def _onboarding_panel(org_name: str, not_onboarded: List[str], automation: Optional[BackstageAutomation], is_demo: bool):
+    """Repository picker and onboarding button, rerun on its own when used."""
+    st.subheader("Onboard New Repositories")
+    selected_repos = st.multiselect(
+        "Select repositories to onboard",
+        options=not_onboarded,
+        key=f"onboard_select_{org_name}"
+    )
+    
+    if st.button("Start Onboarding", key=f"onboard_{org_name}"):
+        if selected_repos:
+            if not is_demo:
+                messages = []
+                for repo_name, result in bulk_onboard(automation, selected_repos):
+                    if isinstance(result, Exception):
+                        messages.append(("error", f"Failed to onboard {repo_name}: {str(result)}"))
+                    else:
+                        pr, issue = result
+                        messages.append(("success", f"Created PR #{pr.number} for {repo_name}"))
+                clear_repo_status(org_name)
+                # Rerun the whole page so the metrics, table and picker reflect the new PRs;
+                # branch names are timestamped, so a stale selection would open duplicates
+                st.session_state[f"onboard_results_{org_name}"] = messages
+                st.session_state.pop(f"onboard_select_{org_name}", None)
+                st.rerun(scope="app")
             else:
-                st.warning("Please select at least one repository.")
+                st.info("Demo mode: Onboarding simulation successful!")
+        else:
+            st.warning("Please select at least one repository.")
 
 # Sidebar - Organization Management
 with st.sidebar:
@@ -188,15 +406,23 @@ with st.sidebar:
                 "GitHub API URL (Optional)",
                 placeholder="e.g., https://github.enterprise.com/api/v3"
             )
+            extra_tokens = st.text_input(
+                "Additional GitHub Tokens (Optional)",
+                type="password",
+                help="Comma-separated; requests are spread across all tokens to raise the rate limit"
+            )
             
             if st.form_submit_button("Add Organization"):
                 if new_org_name and github_token and backstage_url:
                     config = {
                         "github_token": github_token,
+                        "github_tokens": [t.strip() for t in extra_tokens.split(",") if t.strip()],
                         "backstage_url": backstage_url,
                         "github_api_url": github_api_url if github_api_url else None
                     }
                     storage.save_org_config(new_org_name, config)
+                    _list_orgs.clear()
+                    _load_cfg.clear()
                     st.success(f"Organization {new_org_name} added successfully!")
                 else:
                     st.error("Please fill in all required fields.")
@@ -205,18 +431,18 @@ with st.sidebar:
 st.title("🚀 Backstage Integration Dashboard")
 
 # Get list of organizations
-orgs = storage.list_organizations()
+orgs = _list_orgs()
 orgs.append("Demo Organization")  # Add demo organization
 
 if not orgs:
     st.info("No organizations configured. Add one from the sidebar!")
 else:
-    # Create tabs for each organization
-    tabs = st.tabs(orgs)
-    for i, tab in enumerate(tabs):
-        with tab:
-            org_name = orgs[i]
-            if org_name == "Demo Organization":
-                render_org_dashboard(org_name, is_demo=True)
-            else:
-                render_org_dashboard(org_name)
+    # Only the selected organization's dashboard is rendered (and fetched)
+    org_name = st.radio(
+        "Organization",
+        orgs,
+        horizontal=True,
+        label_visibility="collapsed",
+        key="active_org"
+    )
+    render_org_dashboard(org_name, is_demo=(org_name == "Demo Organization"))
@@ -1,28 +1,441 @@
+import io
 import os
+import re
+import json
+import base64
 import time
-from github import Github
+import queue
+import itertools
+import threading
+from github import Github, GithubException
 import yaml
 import requests
-from typing import Tuple, Dict, Any, List
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Tuple, Dict, Any, List, Callable, Optional, Iterable, Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from rate_limiter import RateLimiter, TokenPool, PooledTokenAuth, retry_rate_limited
+from etag_cache import ConditionalRequestCache
+
+# Prefer the libyaml C implementation when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+ORG_REPOS_QUERY = """
+query($org: String!, $cursor: String) {
+  organization(login: $org) {
+    repositories(first: 100, after: $cursor) {
+      pageInfo { endCursor hasNextPage }
+      nodes {
+        name
+        updatedAt
+        primaryLanguage { name }
+        catalogInfo: object(expression: "HEAD:catalog-info.yaml") { ... on Blob { oid } }
+        pullRequests(first: 20, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) {
+          pageInfo { hasNextPage }
+          nodes { number headRefName }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Connections kept open per host; sized above the 8 worker threads used for repo scans
+HTTP_POOL_SIZE = 16
+
+# Paths whose presence decides the component type, checked in this order
+SERVICE_MARKERS = frozenset(["Dockerfile", "docker-compose.yml", "k8s", "kubernetes"])
+WEBSITE_MARKERS = frozenset(["package.json", "index.html", "public/index.html", "src/index.js"])
+LIBRARY_MARKERS = frozenset(["setup.py", "composer.json", "go.mod"])
+
+# Team mentions such as @org/team in CODEOWNERS
+CODEOWNER_TEAM_RE = re.compile(r'@[\w-]+/[\w-]+')
+
+# File name endings recognized as API specifications
+SPEC_SUFFIXES = (
+    "openapi.yaml", "openapi.yml", "openapi.json",
+    "swagger.yaml", "swagger.yml", "swagger.json",
+    "asyncapi.yaml", "asyncapi.yml", "asyncapi.json",
+    "graphql.schema", "schema.graphql"
+)
+
+# Directories searched for API specifications besides the repository root
+SPEC_DIRS = frozenset(["docs", "api", "specs"])
+
+# Substrings of root entries that indicate developer documentation
+DEV_FILE_RE = re.compile(r'readme\.md|api\.md|docs|api|swagger\.yml|openapi\.yml', re.IGNORECASE)
+
+# Keywords in descriptions and topics that suggest a developer-facing API or SDK
+API_KEYWORD_RE = re.compile(r'api|sdk|library|client|developer|toolkit', re.IGNORECASE)
+
+# Number of repository tree listings kept in memory
+TREE_CACHE_SIZE = 512
+
+# Prefix of the branches created by create_pr_and_issue
+BACKSTAGE_BRANCH_PREFIX = "backstage-integration"
+
+# Fixed-schema catalog entities; every placeholder is filled with _yaml_scalar output
+COMPONENT_TEMPLATE = """\
+apiVersion: backstage.io/v1alpha1
+kind: Component
+metadata:
+  name: {name}
+  description: {description}
+  annotations:
+    github.com/project-slug: {slug}
+    github.com/project-visibility: {visibility}
+  tags: [{tags}]
+spec:
+  type: {type}
+  lifecycle: {lifecycle}
+  owner: {owner}
+  system: {system}
+"""
+
+API_TEMPLATE = """\
+apiVersion: backstage.io/v1alpha1
+kind: API
+metadata:
+  name: {name}
+  description: {description}
+  annotations:
+    github.com/project-slug: {slug}
+    backstage.io/source-location: {source_location}
+spec:
+  type: {type}
+  lifecycle: production
+  owner: default-team
+  definition: {definition}
+"""
+
+# Written to automation_summary.txt at the end of main()
+AUTOMATION_SUMMARY_TEMPLATE = """\
+## Automation Summary ({timestamp})
+### Mode: {mode}
+- {target}
+- Processed: {processed} repositories
+- Skipped: {skipped} repositories (already onboarded)
+- Failed: {failed} repositories"""
+
+# Status report marker for each repository status
+STATUS_EMOJI = {"onboarded": "✅", "in_progress": "🔄", "not_onboarded": "❌", "error": "⚠️"}
+
+# Characters JSON leaves unescaped that YAML treats as line breaks (NEL, LS, PS)
+# or does not allow in a stream (C1 controls, BOM, noncharacters)
+YAML_UNSAFE_RE = re.compile('[\x7f-\x9f\u2028\u2029\ufeff\ufffe\uffff]')
+
+def _yaml_scalar(value: str) -> str:
+    r"""Quote a string as a double-quoted YAML scalar.
+
+    JSON strings are valid double-quoted YAML scalars. Non-ASCII text is kept
+    as-is, since PyYAML decodes a JSON surrogate pair as two lone surrogates,
+    and only the characters YAML would fold or reject are escaped.
+
+    >>> text = 'He said "hi": #1 C:\\dir\nnext line \U0001F680'
+    >>> yaml.safe_load(f"key: {_yaml_scalar(text)}")["key"] == text
+    True
+    """
+    return YAML_UNSAFE_RE.sub(lambda m: f"\\u{ord(m.group()):04x}", json.dumps(str(value), ensure_ascii=False))
+
+def _as_utc(value: datetime) -> datetime:
+    """Return a timezone-aware UTC datetime; older PyGithub releases return naive UTC values."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
 
 class BackstageAutomation:
-    def __init__(self, github_token: str, org_name: str, github_api_url: str = None):
+    def __init__(self, github_token: str, org_name: str, github_api_url: str = None, github_tokens: List[str] = None):
         """Initialize the BackstageAutomation class.
 
         Args:
             github_token (str): GitHub personal access token
             org_name (str): GitHub organization name
             github_api_url (str, optional): Custom GitHub API URL for enterprise servers
+            github_tokens (List[str], optional): Additional tokens to round-robin requests over
         """
+        self.token_pool = TokenPool([github_token] + list(github_tokens or []))
+        self._auth = PooledTokenAuth(self.token_pool)
+        github_kwargs = {
+            "auth": self._auth,
+            "pool_size": HTTP_POOL_SIZE,
+            "per_page": 100,  # GitHub's maximum; a third of the requests of the default 30
+            # Rate limits are handled by retry_rate_limited, which switches tokens
+            # rather than sleeping on the exhausted one like PyGithub's GithubRetry
+            "retry": Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+        }
         if github_api_url:
-            self.github = Github(base_url=github_api_url, login_or_token=github_token)
+            self.github = Github(base_url=github_api_url, **github_kwargs)
         else:
-            self.github = Github(github_token)
+            self.github = Github(**github_kwargs)
+        # Keep-alive session for requests made outside PyGithub (GraphQL, Backstage)
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            # urllib3 only retries idempotent methods by default, so POSTs are sent once
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
         self.org = self.github.get_organization(org_name)
+        # Revalidate repeated REST reads with If-None-Match; 304s are not rate limited
+        self.etag_cache = ConditionalRequestCache()
+        self.etag_cache.install(self.org._requester)
+        self.rate_limiter = RateLimiter()
+        retry_rate_limited(self.org._requester, self._auth, self.rate_limiter)
         self.base_branch = "main"
         self.github_api_url = github_api_url
+        if github_api_url:
+            # Enterprise servers expose GraphQL at /api/graphql next to /api/v3
+            self.graphql_url = github_api_url.rstrip("/").rsplit("/v3", 1)[0] + "/graphql"
+        else:
+            self.graphql_url = "https://api.github.com/graphql"
         self.status_report = []
+        # Guards mutable state when one instance is shared between threads
+        self._lock = threading.Lock()
+        # Memoized git tree listings shared by the per-repository analyses
+        self._tree_cache: "OrderedDict[Tuple[str, Any, bool], Tuple[frozenset, Dict[str, str]]]" = OrderedDict()
+        self._tree_cache_lock = threading.Lock()
+
+    def throttled(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call a function that talks to GitHub under the shared rate limiter.
+
+        Args:
+            func: Callable making one or more GitHub API requests
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Any: Whatever func returns
+        """
+        with self.rate_limiter:
+            try:
+                result = func(*args, **kwargs)
+            except GithubException as e:
+                self.rate_limiter.observe_headers(e.headers or {})
+                raise
+        # Per-token budgets are recorded response by response in retry_rate_limited
+        return result
+
+    def _pipelined_pages(self, paginated_list: Iterable[Any], prefetch: int = 2) -> Iterator[Any]:
+        """Yield items from a PyGithub PaginatedList while later pages download in the background.
+
+        Args:
+            paginated_list: PaginatedList such as org.get_repos(); plain iterables are passed through
+            prefetch (int, optional): Number of pages fetched ahead of the consumer
+
+        Returns:
+            Iterator[Any]: Items in the order GitHub returns them
+        """
+        if not hasattr(paginated_list, "get_page"):
+            yield from paginated_list
+            return
+
+        pages: "queue.Queue[Any]" = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+
+        def offer(item: Any):
+            # Give up once the consumer has stopped reading so the thread can exit
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+
+        def produce():
+            page_number = 0
+            try:
+                while not stop.is_set():
+                    page = self.throttled(paginated_list.get_page, page_number)
+                    if not page:
+                        break
+                    offer(page)
+                    page_number += 1
+            except Exception as e:
+                offer(e)
+                return
+            offer(None)  # End of pages
+
+        threading.Thread(target=produce, daemon=True).start()
+        try:
+            while True:
+                page = pages.get()
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield from page
+        finally:
+            stop.set()
+
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a GraphQL query against the GitHub API.
+
+        Args:
+            query (str): GraphQL query document
+            variables (Dict[str, Any]): Query variables
+
+        Returns:
+            Dict[str, Any]: The "data" section of the response
+
+        Raises:
+            RuntimeError: If the response contains GraphQL errors
+        """
+        token = self.token_pool.next_token()
+        with self.rate_limiter:
+            response = self._http.post(
+                self.graphql_url,
+                json={"query": query, "variables": variables},
+                headers={
+                    'Authorization': f'bearer {token}',
+                    'User-Agent': 'Backstage-Automation'
+                },
+                timeout=30
+            )
+        # GraphQL has its own point budget, so only secondary limits affect REST callers
+        if 'Retry-After' in response.headers:
+            self.rate_limiter.observe_headers(response.headers)
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("errors"):
+            raise RuntimeError(f"GraphQL query failed: {payload['errors']}")
+        return payload["data"]
+
+    def get_org_repo_summaries(self) -> List[Dict[str, Any]]:
+        """Fetch onboarding data for every repository, 100 repositories per request.
+
+        Returns:
+            List[Dict[str, Any]]: One entry per repository with its name, language,
+                last update time, catalog-info.yaml presence and open Backstage PR number
+        """
+        summaries = []
+        # Repositories with more open PRs than the query returns, none of them a Backstage PR
+        truncated = []
+        cursor = None
+        while True:
+            data = self._graphql(ORG_REPOS_QUERY, {"org": self.org.login, "cursor": cursor})
+            repositories = data["organization"]["repositories"]
+            for node in repositories["nodes"]:
+                backstage_pr = next(
+                    (pr["number"] for pr in node["pullRequests"]["nodes"]
+                     if pr["headRefName"].startswith(BACKSTAGE_BRANCH_PREFIX)),
+                    None
+                )
+                summary = {
+                    "name": node["name"],
+                    "language": (node["primaryLanguage"] or {}).get("name"),
+                    "updated_at": datetime.fromisoformat(node["updatedAt"].replace("Z", "+00:00")),
+                    "has_catalog": node["catalogInfo"] is not None,
+                    "backstage_pr": backstage_pr
+                }
+                summaries.append(summary)
+                if backstage_pr is None and node["pullRequests"]["pageInfo"]["hasNextPage"]:
+                    truncated.append(summary)
+            if not repositories["pageInfo"]["hasNextPage"]:
+                break
+            cursor = repositories["pageInfo"]["endCursor"]
+
+        if truncated:
+            # An older Backstage PR can sit behind 20 newer ones; one search covers them all
+            open_prs = self.throttled(self.get_open_backstage_prs)
+            for summary in truncated:
+                summary["backstage_pr"] = open_prs.get(summary["name"])
+        return summaries
+
+    def _tree_listing(self, repo: Any, recursive: bool) -> Tuple[frozenset, Dict[str, str]]:
+        """Fetch and memoize the paths and object SHAs of a repository's default-branch tree.
+
+        Entries are keyed on pushed_at as well as the repository name, so a push
+        invalidates them without an extra API call.
+
+        Args:
+            repo: GitHub repository object
+            recursive (bool): Whether to list the whole tree or only the root
+
+        Returns:
+            Tuple[frozenset, Dict[str, str]]: Paths in the tree, and the SHA of each path
+        """
+        key = (repo.full_name, repo.pushed_at, recursive)
+        with self._tree_cache_lock:
+            if key in self._tree_cache:
+                self._tree_cache.move_to_end(key)
+                return self._tree_cache[key]
+            if not recursive and (repo.full_name, repo.pushed_at, True) in self._tree_cache:
+                # The root listing is a subset of an already cached full listing
+                _, full = self._tree_cache[(repo.full_name, repo.pushed_at, True)]
+                shas = {path: sha for path, sha in full.items() if "/" not in path}
+                return frozenset(shas), shas
+
+        try:
+            if recursive:
+                tree = repo.get_git_tree(repo.default_branch, recursive=True).tree
+            else:
+                tree = repo.get_git_tree(repo.default_branch).tree
+            shas = {entry.path: entry.sha for entry in tree}
+        except GithubException as e:
+            if e.status != 409:  # 409: empty repository, nothing committed yet
+                raise
+            shas = {}
+
+        listing = (frozenset(shas), shas)
+        with self._tree_cache_lock:
+            self._tree_cache[key] = listing
+            if len(self._tree_cache) > TREE_CACHE_SIZE:
+                self._tree_cache.popitem(last=False)
+        return listing
+
+    def get_root_tree_paths(self, repo: Any) -> frozenset:
+        """Get the top-level paths of a repository's default branch.
+
+        Args:
+            repo: GitHub repository object
+
+        Returns:
+            frozenset: File and directory names at the repository root
+        """
+        return self._tree_listing(repo, recursive=False)[0]
+
+    def get_tree_paths(self, repo: Any) -> frozenset:
+        """Get every path in a repository's default branch.
+
+        Args:
+            repo: GitHub repository object
+
+        Returns:
+            frozenset: All file and directory paths in the repository
+        """
+        return self._tree_listing(repo, recursive=True)[0]
+
+    def get_open_backstage_prs(self) -> Dict[str, int]:
+        """Find open Backstage integration PRs across the organization with one search.
+
+        Returns:
+            Dict[str, int]: Repository name mapped to its open integration PR number
+        """
+        results = self.github.search_issues(
+            f"is:pr is:open head:{BACKSTAGE_BRANCH_PREFIX} org:{self.org.login}"
+        )
+        # html_url is https://<host>/<org>/<repo>/pull/<number>; parsing it avoids
+        # a lazy Repository fetch per result
+        return {issue.html_url.split("/")[-3]: issue.number for issue in results}
+
+    def get_onboarded_repo_names(self) -> frozenset:
+        """Find repositories with a root catalog-info.yaml using the code search index.
+
+        Code search is eventually consistent and returns at most 1000 results, so
+        repositories missing from the result still need a direct check.
+
+        Returns:
+            frozenset: Names of repositories the index reports as onboarded
+        """
+        results = self.github.search_code(f"filename:catalog-info.yaml path:/ org:{self.org.login}")
+        # repository comes embedded in each result, so .name needs no extra request
+        return frozenset(result.repository.name for result in results)
 
     def _determine_component_type(self, repo: Any) -> str:
         """Determine the component type based on repository content.
@@ -34,14 +447,15 @@ class BackstageAutomation:
             str: Component type (library, service, website, etc.)
         """
         try:
+            paths = self.get_tree_paths(repo)
             # Check for common service indicators
-            if any(repo.get_contents(file) for file in ["Dockerfile", "docker-compose.yml", "k8s", "kubernetes"]):
+            if paths & SERVICE_MARKERS:
                 return "service"
             # Check for website/frontend indicators
-            elif any(repo.get_contents(file) for file in ["package.json", "index.html", "public/index.html", "src/index.js"]):
+            elif paths & WEBSITE_MARKERS:
                 return "website"
             # Check for library indicators
-            elif any(repo.get_contents(file) for file in ["setup.py", "composer.json", "go.mod"]):
+            elif paths & LIBRARY_MARKERS:
                 return "library"
             # Default to service if unclear
             return "service"
@@ -69,11 +483,12 @@ class BackstageAutomation:
             # Check repository age and activity
             created_date = repo.created_at
             last_push = repo.pushed_at
-            commits = repo.get_commits()
             
-            if (datetime.now() - created_date).days < 90:  # Less than 3 months old
+            if (datetime.now(timezone.utc) - _as_utc(created_date)).days < 90:  # Less than 3 months old
                 return "experimental"
-            elif commits.totalCount > 100 and last_push:  # Active with significant history
+            # totalCount issues a single per_page=1 request and reads the page count
+            # from the Link header; skip it entirely for repositories never pushed to
+            elif last_push and repo.get_commits().totalCount > 100:  # Active with significant history
                 return "production"
             else:
                 return "development"
@@ -90,30 +505,22 @@ class BackstageAutomation:
             str: Owner (team or individual)
         """
         try:
-            # Try to get CODEOWNERS file
-            try:
-                codeowners = repo.get_contents("CODEOWNERS")
-                if codeowners:
-                    content = codeowners.decoded_content.decode()
-                    # Look for team mentions in CODEOWNERS
-                    import re
-                    teams = re.findall(r'@[\w-]+/[\w-]+', content)
-                    if teams:
-                        return teams[0].replace('@', '')  # Return first team found
-            except Exception:
-                pass
-
-            # Try to get most active contributors
-            contributors = repo.get_contributors()
-            if contributors.totalCount > 0:
-                top_contributor = next(contributors)
-                # Try to get user's team membership
-                try:
-                    teams = self.org.get_user_teams(top_contributor)
-                    if teams.totalCount > 0:
-                        return f"{next(teams).name}"
-                except Exception:
-                    return f"user:{top_contributor.login}"
+            # Try to get CODEOWNERS file; the cached tree says whether it exists,
+            # so a missing file costs no request
+            if "CODEOWNERS" in self.get_root_tree_paths(repo):
+                content = repo.get_contents("CODEOWNERS").decoded_content.decode()
+                # Look for team mentions in CODEOWNERS
+                teams = CODEOWNER_TEAM_RE.findall(content)
+                if teams:
+                    return teams[0].replace('@', '')  # Return first team found
+
+            # Fall back to the most active contributor; only the first entry of one
+            # per_page=1 page is needed, so skip building NamedUser objects
+            _, contributors = repo._requester.requestJsonAndCheck(
+                "GET", f"{repo.url}/contributors", parameters={"per_page": 1}
+            )
+            if contributors:  # None for empty repositories (204 No Content)
+                return f"user:{contributors[0]['login']}"
 
             return "default-team"  # Fallback
         except Exception:
@@ -146,26 +553,17 @@ class BackstageAutomation:
         if repo.topics:
             tags.extend(repo.topics)
         
-        catalog_content = {
-            'apiVersion': 'backstage.io/v1alpha1',
-            'kind': 'Component',
-            'metadata': {
-                'name': component_name,
-                'description': description,
-                'annotations': {
-                    'github.com/project-slug': f'{self.org.login}/{repo_name}',
-                    'github.com/project-visibility': 'public' if not repo.private else 'private'
-                },
-                'tags': tags
-            },
-            'spec': {
-                'type': component_type,
-                'lifecycle': lifecycle,
-                'owner': owner,
-                'system': repo.topics[0] if repo.topics else 'default-system'
-            }
-        }
-        return yaml.dump(catalog_content)
+        return COMPONENT_TEMPLATE.format(
+            name=_yaml_scalar(component_name),
+            description=_yaml_scalar(description),
+            slug=_yaml_scalar(f'{self.org.login}/{repo_name}'),
+            visibility='public' if not repo.private else 'private',
+            tags=", ".join(_yaml_scalar(tag) for tag in tags),
+            type=_yaml_scalar(component_type),
+            lifecycle=_yaml_scalar(lifecycle),
+            owner=_yaml_scalar(owner),
+            system=_yaml_scalar(repo.topics[0] if repo.topics else 'default-system')
+        )
 
     def create_pr_and_issue(self, repo_name: str) -> Tuple[Any, Any]:
         """Create pull request and linked issue for Backstage integration.
@@ -177,7 +575,7 @@ class BackstageAutomation:
             Tuple[PullRequest, Issue]: Created PR and Issue objects
         """
         repo = self.org.get_repo(repo_name)
-        branch_name = f"backstage-integration-{int(time.time())}"
+        branch_name = f"{BACKSTAGE_BRANCH_PREFIX}-{int(time.time())}"
         
         # Create new branch
         source = repo.get_branch(self.base_branch)
@@ -220,10 +618,14 @@ jobs:
         # Create .github/workflows directory if it doesn't exist
         try:
             repo.get_contents(".github/workflows")
-        except Exception:
+        except GithubException as e:
+            if e.status != 404:
+                raise
             try:
                 repo.get_contents(".github")
-            except Exception:
+            except GithubException as e:
+                if e.status != 404:
+                    raise
                 repo.create_file(
                     ".github/README.md",
                     "Add .github directory",
@@ -310,6 +712,23 @@ Note: Force merge should only be used after proper review and secret configurati
         Returns:
             bool: True if successful, False otherwise
 
+        Raises:
+            ValueError: If no Backstage token is available
+        """
+        return self.publish_batch_to_backstage(backstage_url, [catalog_info], backstage_token, token_type)
+
+    def publish_batch_to_backstage(self, backstage_url: str, catalog_infos: List[str], backstage_token: str = None, token_type: str = "Bearer") -> bool:
+        """Publish several catalog documents to Backstage in a single request.
+
+        Args:
+            backstage_url (str): Backstage instance URL
+            catalog_infos (List[str]): Catalog info YAML contents, sent as one multi-document payload
+            backstage_token (str, optional): Backstage API token. If not provided, will try to get from environment
+            token_type (str, optional): Token type for authentication. Defaults to "Bearer"
+
+        Returns:
+            bool: True if successful, False otherwise
+
         Raises:
             ValueError: If no Backstage token is available
         """
@@ -327,13 +746,14 @@ Note: Force merge should only be used after proper review and secret configurati
             'Authorization': f'{auth_type} {token}'
         }
 
+        payload = "\n---\n".join(catalog_infos)
         try:
-            # Validate YAML before sending
-            yaml.safe_load(catalog_info)
+            # Validate every YAML document before sending
+            list(yaml.load_all(payload, Loader=YamlLoader))
             
-            response = requests.post(
+            response = self._http.post(
                 f"{backstage_url}/api/catalog/locations",
-                data=catalog_info,
+                data=payload,
                 headers=headers,
                 timeout=30  # 30 seconds timeout
             )
@@ -375,10 +795,10 @@ Note: Force merge should only be used after proper review and secret configurati
             # Read and validate YAML file
             with open(catalog_path, 'r') as f:
                 catalog_content = f.read()
-            yaml.safe_load(catalog_content)  # Validate YAML syntax
+            list(yaml.load_all(catalog_content, Loader=YamlLoader))  # Validate YAML syntax of every document
             
             # Make raw API call to Backstage
-            response = requests.post(
+            response = self._http.post(
                 f"{backstage_url}/api/catalog/locations",
                 data=catalog_content,
                 headers=headers,
@@ -449,17 +869,14 @@ Note: Force merge should only be used after proper review and secret configurati
         branch = pr.base.ref
         
         try:
-            # Get current branch protection
-            protection = None
-            try:
-                protection = repo.get_branch(branch).get_protection()
-            except Exception:
-                # Branch might not have protection
-                pass
+            # The branch listing already says whether protection is enabled,
+            # so unprotected branches need no protection calls at all
+            branch_obj = repo.get_branch(branch)
+            had_protection = branch_obj.protected
 
-            if protection:
+            if had_protection:
                 # Temporarily disable branch protection
-                repo.get_branch(branch).remove_protection()
+                branch_obj.remove_protection()
 
             # Merge the PR
             merge_result = pr.merge(
@@ -468,9 +885,9 @@ Note: Force merge should only be used after proper review and secret configurati
                 commit_message="Force merged via Backstage automation"
             )
 
-            if protection:
+            if had_protection:
                 # Restore branch protection
-                repo.get_branch(branch).edit_protection(
+                branch_obj.edit_protection(
                     strict=True,
                     contexts=[],
                     enforce_admins=True,
@@ -488,69 +905,98 @@ Note: Force merge should only be used after proper review and secret configurati
 
     def generate_status_report(self) -> str:
         """Generate a status report for GitHub Actions."""
-        total = onboarded = in_progress = not_onboarded = 0
-        repositories = self.org.get_repos()
-        
-        for repo in repositories:
-            total += 1
-            try:
-                try:
-                    repo.get_contents("catalog-info.yaml")
-                    onboarded += 1
-                    self.status_report.append(f"✅ {repo.name}: Onboarded")
-                    continue
-                except Exception:
-                    pass
-
-                # Check for open PRs
-                open_prs = repo.get_pulls(state='open')
-                has_pr = False
-                for pr in open_prs:
-                    if "backstage-integration" in pr.head.ref:
-                        in_progress += 1
-                        has_pr = True
-                        self.status_report.append(f"🔄 {repo.name}: In Progress (PR #{pr.number})")
-                        break
-                
-                if not has_pr:
-                    not_onboarded += 1
-                    self.status_report.append(f"❌ {repo.name}: Not Onboarded")
-                
-            except Exception as e:
-                self.status_report.append(f"⚠️ {repo.name}: Error - {str(e)}")
+        with self._lock:
+            self.status_report = []
+            return self._build_status_report()
+
+    def _status_for_repo(self, repo: Any, open_prs: Dict[str, int]) -> Tuple[str, str, str]:
+        """Determine the onboarding status of one repository.
+
+        Args:
+            repo: GitHub repository object
+            open_prs (Dict[str, int]): Open integration PRs from get_open_backstage_prs
+
+        Returns:
+            Tuple[str, str, str]: Status (onboarded, in_progress, not_onboarded or error),
+                repository name and the detail shown in the report
+        """
+        try:
+            if "catalog-info.yaml" in self.get_root_tree_paths(repo):
+                return ("onboarded", repo.name, "Onboarded")
+
+            if repo.name in open_prs:
+                return ("in_progress", repo.name, f"In Progress (PR #{open_prs[repo.name]})")
+
+            return ("not_onboarded", repo.name, "Not Onboarded")
+
+        except Exception as e:
+            return ("error", repo.name, f"Error - {str(e)}")
+
+    def _status_from_summary(self, summary: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Turn a GraphQL repository summary into a status result like _status_for_repo."""
+        if summary["has_catalog"]:
+            return ("onboarded", summary["name"], "Onboarded")
+        if summary["backstage_pr"] is not None:
+            return ("in_progress", summary["name"], f"In Progress (PR #{summary['backstage_pr']})")
+        return ("not_onboarded", summary["name"], "Not Onboarded")
+
+    def _build_status_report(self) -> str:
+        """Collect per-repository status lines and format the summary."""
+        try:
+            results = [self._status_from_summary(summary) for summary in self.get_org_repo_summaries()]
+        except Exception as e:
+            # Fall back to per-repository REST calls if GraphQL is unavailable
+            print(f"GraphQL status query failed, falling back to REST: {str(e)}")
+            # One org-wide search instead of listing every repository's pull requests
+            open_prs = self.throttled(self.get_open_backstage_prs)
+            repositories = self._pipelined_pages(self.org.get_repos())
+            # Capped at 8 workers to stay within GitHub's secondary rate limits
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(lambda repo: self.throttled(self._status_for_repo, repo, open_prs), repositories))
+
+        counts = Counter(status for status, _, _ in results)
+        total = len(results)
+        onboarded = counts["onboarded"]
+        in_progress = counts["in_progress"]
+        not_onboarded = counts["not_onboarded"]
+        self.status_report = results
 
         # Generate summary
         summary = [
-            f"## Status Summary ({datetime.now().strftime('%Y-%m-%d %H:%M UTC')})",
+            f"## Status Summary ({datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')})",
             f"- Total Repositories: {total}",
             f"- ✅ Onboarded: {onboarded}",
             f"- 🔄 In Progress: {in_progress}",
             f"- ❌ Not Onboarded: {not_onboarded}",
             "",
-            "## Repository Details:",
-            *self.status_report
+            "## Repository Details:"
         ]
-        
-        return "\n".join(summary)
+        # Lines are formatted once, straight into the join
+        details = (f"{STATUS_EMOJI[status]} {name}: {detail}" for status, name, detail in self.status_report)
 
-    def analyze_repository_priority(self, repo: Any) -> Dict[str, Any]:
+        return "\n".join(itertools.chain(summary, details))
+
+    def analyze_repository_priority(self, repo: Any, now: Optional[datetime] = None) -> Dict[str, Any]:
         """Analyze a repository to determine its priority for Backstage integration.
 
         Args:
             repo: GitHub repository object
+            now (datetime, optional): Timezone-aware reference time, shared across a report run
 
         Returns:
             Dict[str, Any]: Analysis results with score and reasons
         """
+        if now is None:
+            now = datetime.now(timezone.utc)
         score = 0
         reasons = []
 
         # Activity metrics
-        if (datetime.now() - repo.pushed_at).days <= 30:  # Updated in last 30 days
+        if repo.pushed_at and (now - _as_utc(repo.pushed_at)).days <= 30:  # Updated in last 30 days
             score += 30
             reasons.append("Recently active")
 
-        if (datetime.now() - repo.created_at).days >= 180:  # Established project (>6 months)
+        if (now - _as_utc(repo.created_at)).days >= 180:  # Established project (>6 months)
             score += 20
             reasons.append("Established project")
 
@@ -565,20 +1011,17 @@ Note: Force merge should only be used after proper review and secret configurati
 
         # Developer-facing indicators
         try:
-            files = [f.name for f in repo.get_contents("")]
-            dev_files = ["README.md", "API.md", "docs", "api", "swagger.yml", "openapi.yml"]
-            matches = [f for f in files if any(df.lower() in f.lower() for df in dev_files)]
-            if matches:
+            files = self.get_root_tree_paths(repo)
+            if any(DEV_FILE_RE.search(f) for f in files):
                 score += 30
                 reasons.append("Has developer documentation")
 
             # Check for API/SDK keywords in description and topics
-            api_keywords = ["api", "sdk", "library", "client", "developer", "toolkit"]
-            if repo.description and any(k in repo.description.lower() for k in api_keywords):
+            if repo.description and API_KEYWORD_RE.search(repo.description):
                 score += 20
                 reasons.append("API/SDK-related description")
 
-            if repo.topics and any(k in t.lower() for t in repo.topics for k in api_keywords):
+            if repo.topics and any(API_KEYWORD_RE.search(t) for t in repo.topics):
                 score += 20
                 reasons.append("API/SDK-related topics")
 
@@ -609,6 +1052,31 @@ Note: Force merge should only be used after proper review and secret configurati
             "forks": repo.forks_count
         }
 
+    def _priority_for_repo(self, repo: Any, now: datetime) -> Optional[Dict[str, Any]]:
+        """Score one repository for the priority report.
+
+        Args:
+            repo: GitHub repository object
+            now (datetime): Reference time for the activity checks
+
+        Returns:
+            Optional[Dict[str, Any]]: Analysis results, or None if the repository is
+                already onboarded, scores too low or could not be analyzed
+        """
+        try:
+            # Skip if already has catalog-info.yaml; the cached root listing also
+            # serves the documentation check in analyze_repository_priority
+            if "catalog-info.yaml" in self.get_root_tree_paths(repo):
+                return None
+
+            result = self.analyze_repository_priority(repo, now)
+            if result["score"] > 30:  # Only include repositories with meaningful scores
+                return result
+
+        except Exception as e:
+            print(f"Error analyzing {repo.name}: {str(e)}")
+        return None
+
     def generate_priority_report(self) -> str:
         """Generate a report of repositories prioritized for Backstage integration.
 
@@ -616,89 +1084,71 @@ Note: Force merge should only be used after proper review and secret configurati
             str: Markdown formatted priority report
         """
         print("Analyzing repositories for Backstage integration priority...")
-        repositories = self.org.get_repos()
-        analysis_results = []
-
-        for repo in repositories:
-            try:
-                # Skip if already has catalog-info.yaml
-                try:
-                    repo.get_contents("catalog-info.yaml")
-                    continue
-                except Exception:
-                    pass
-
-                result = self.analyze_repository_priority(repo)
-                if result["score"] > 30:  # Only include repositories with meaningful scores
-                    analysis_results.append(result)
-
-            except Exception as e:
-                print(f"Error analyzing {repo.name}: {str(e)}")
+        now = datetime.now(timezone.utc)
+        repositories = self._pipelined_pages(self.org.get_repos())
+        # Capped at 8 workers to stay within GitHub's secondary rate limits
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = executor.map(lambda repo: self.throttled(self._priority_for_repo, repo, now), repositories)
+            analysis_results = [result for result in results if result is not None]
 
         # Sort by score descending
         analysis_results.sort(key=lambda x: x["score"], reverse=True)
 
         # Generate markdown report
-        report_lines = [
-            "# Backstage Integration Priority Report",
-            f"\nGenerated on: {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}",
-            "\n## Top Candidates for Backstage Integration\n"
-        ]
+        report = io.StringIO()
+        report.write("# Backstage Integration Priority Report\n")
+        report.write(f"\nGenerated on: {now.strftime('%Y-%m-%d %H:%M UTC')}\n")
+        report.write("\n## Top Candidates for Backstage Integration\n")
 
         for idx, result in enumerate(analysis_results[:10], 1):
-            report_lines.extend([
-                f"### {idx}. {result['name']} (Score: {result['score']})",
-                f"- URL: {result['url']}",
-                f"- Description: {result['description']}",
-                f"- Last Updated: {result['updated_at']}",
-                f"- Stars: {result['stars']}, Forks: {result['forks']}",
-                "\nRecommendation reasons:",
-                "".join([f"\n- {reason}" for reason in result['reasons']]),
-                "\n"
-            ])
-
-        return "\n".join(report_lines)
-
-    def _detect_api_specs(self, repo: Any) -> List[Dict[str, str]]:
+            report.write(f"\n### {idx}. {result['name']} (Score: {result['score']})")
+            report.write(f"\n- URL: {result['url']}")
+            report.write(f"\n- Description: {result['description']}")
+            report.write(f"\n- Last Updated: {result['updated_at']}")
+            report.write(f"\n- Stars: {result['stars']}, Forks: {result['forks']}")
+            report.write("\n\nRecommendation reasons:\n")
+            for reason in result['reasons']:
+                report.write(f"\n- {reason}")
+            report.write("\n\n")
+
+        return report.getvalue()
+
+    def _detect_api_specs(self, repo: Any, inline_api_content: bool = False) -> List[Dict[str, str]]:
         """Detect API specifications in the repository.
 
         Args:
             repo: GitHub repository object
+            inline_api_content (bool, optional): Download each spec instead of referencing it by URL
 
         Returns:
-            List[Dict[str, str]]: List of API specs with their paths and types
+            List[Dict[str, str]]: List of API specs with their paths, types, blob URLs and, when inlined, content
         """
         api_specs = []
-        spec_patterns = [
-            "openapi.yaml", "openapi.yml", "openapi.json",
-            "swagger.yaml", "swagger.yml", "swagger.json",
-            "asyncapi.yaml", "asyncapi.yml", "asyncapi.json",
-            "graphql.schema", "schema.graphql"
-        ]
-        
         try:
-            contents = repo.get_contents("")
-            for content in contents:
-                if content.type == "dir":
-                    try:
-                        # Check docs, api, specs directories
-                        if content.name.lower() in ["docs", "api", "specs"]:
-                            subcontents = repo.get_contents(content.path)
-                            for subcontent in subcontents:
-                                if any(subcontent.name.lower().endswith(pat) for pat in spec_patterns):
-                                    api_specs.append({
-                                        "path": subcontent.path,
-                                        "type": self._determine_api_type(subcontent.name),
-                                        "content": subcontent.decoded_content.decode()
-                                    })
-                    except Exception:
-                        continue
-                elif any(content.name.lower().endswith(pat) for pat in spec_patterns):
-                    api_specs.append({
-                        "path": content.path,
-                        "type": self._determine_api_type(content.name),
-                        "content": content.decoded_content.decode()
-                    })
+            paths, shas = self._tree_listing(repo, recursive=True)
+            for path in sorted(paths):
+                parts = path.split("/")
+                # Check the repository root and the docs, api, specs directories
+                if len(parts) > 2 or (len(parts) == 2 and parts[0].lower() not in SPEC_DIRS):
+                    continue
+                if not parts[-1].lower().endswith(SPEC_SUFFIXES):
+                    continue
+                api_spec = {
+                    "path": path,
+                    "type": self._determine_api_type(parts[-1]),
+                    # Used for both the source location and the $text definition
+                    "url": f"{repo.html_url}/blob/{repo.default_branch}/{path}"
+                }
+                if not inline_api_content:
+                    # Backstage resolves $text references itself, so no blob download is needed
+                    api_specs.append(api_spec)
+                    continue
+                try:
+                    # Fetch the blob by the SHA from the tree listing; no path lookup needed
+                    api_spec["content"] = base64.b64decode(repo.get_git_blob(shas[path]).content).decode()
+                    api_specs.append(api_spec)
+                except Exception:
+                    continue
         except Exception as e:
             print(f"Error detecting API specs: {str(e)}")
         
@@ -722,42 +1172,37 @@ Note: Force merge should only be used after proper review and secret configurati
             return "graphql"
         return "openapi"  # default to OpenAPI
 
-    def create_api_entity(self, repo_name: str, api_spec: Dict[str, str]) -> str:
+    def create_api_entity(self, repo_name: str, api_spec: Dict[str, str], inline_api_content: bool = False) -> str:
         """Create Backstage API entity YAML content.
         
         Args:
             repo_name (str): Repository name
             api_spec (Dict[str, str]): API specification details
+            inline_api_content (bool, optional): Embed the spec content rather than a $text URL reference
             
         Returns:
             str: YAML content for API entity
         """
-        api_content = {
-            'apiVersion': 'backstage.io/v1alpha1',
-            'kind': 'API',
-            'metadata': {
-                'name': f"{repo_name}-api",
-                'description': f'API for {repo_name}',
-                'annotations': {
-                    'github.com/project-slug': f'{self.org.login}/{repo_name}',
-                    'backstage.io/source-location': f'url:https://github.com/{self.org.login}/{repo_name}/blob/main/{api_spec["path"]}'
-                }
-            },
-            'spec': {
-                'type': api_spec['type'],
-                'lifecycle': 'production',
-                'owner': 'default-team',
-                'definition': api_spec['content']
-            }
-        }
-        return yaml.dump(api_content)
+        if inline_api_content and 'content' in api_spec:
+            definition = _yaml_scalar(api_spec['content'])
+        else:
+            definition = f"{{$text: {_yaml_scalar(api_spec['url'])}}}"
+        return API_TEMPLATE.format(
+            name=_yaml_scalar(f"{repo_name}-api"),
+            description=_yaml_scalar(f'API for {repo_name}'),
+            slug=_yaml_scalar(f'{self.org.login}/{repo_name}'),
+            source_location=_yaml_scalar(f"url:{api_spec['url']}"),
+            type=_yaml_scalar(api_spec['type']),
+            definition=definition
+        )
 
-    def create_catalog_entities(self, repo_name: str, component_name: str) -> List[str]:
+    def create_catalog_entities(self, repo_name: str, component_name: str, inline_api_content: bool = False) -> List[str]:
         """Create all necessary catalog entities (Component and APIs).
         
         Args:
             repo_name (str): Repository name
             component_name (str): Component name for Backstage
+            inline_api_content (bool, optional): Embed API spec contents instead of referencing them by URL
             
         Returns:
             List[str]: List of YAML contents for all entities
@@ -770,13 +1215,80 @@ Note: Force merge should only be used after proper review and secret configurati
         entities.append(component_yaml)
 
         # Look for API specs and create API entities
-        api_specs = self._detect_api_specs(repo)
+        api_specs = self._detect_api_specs(repo, inline_api_content)
         for api_spec in api_specs:
-            api_yaml = self.create_api_entity(repo_name, api_spec)
+            api_yaml = self.create_api_entity(repo_name, api_spec, inline_api_content)
             entities.append(api_yaml)
 
         return entities
 
+def _bounded_map(executor: Executor, func: Callable[[Any], Any], items: Iterable[Any], max_in_flight: int = 20) -> Iterator[Any]:
+    """Like executor.map, but only pulls the next item once fewer than max_in_flight are pending.
+
+    executor.map submits its whole input up front; bounding it lets repository
+    pages download while earlier repositories are still being onboarded.
+
+    Args:
+        executor (Executor): Pool running func
+        func: Callable applied to every item
+        items: Iterable of inputs, typically a lazily paginated listing
+        max_in_flight (int, optional): Maximum number of submitted but unconsumed calls
+
+    Returns:
+        Iterator[Any]: Results in input order
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def _onboard_repository(automation: BackstageAutomation, repo_name: str) -> str:
+    """Open the integration PR and issue for a repository known not to be onboarded.
+
+    Args:
+        automation (BackstageAutomation): Automation instance shared by the worker threads
+        repo_name (str): Repository name
+
+    Returns:
+        str: "processed" or "failed"
+    """
+    try:
+        pr, issue = automation.create_pr_and_issue(repo_name)
+        print(f"Created PR #{pr.number} for {repo_name}")
+        return "processed"
+    except Exception as repo_error:
+        print(f"Error processing repository {repo_name}: {str(repo_error)}")
+        return "failed"
+
+def _process_repository(automation: BackstageAutomation, repo: Any, onboarded: frozenset = frozenset()) -> str:
+    """Open the integration PR and issue for one repository unless it is already onboarded.
+
+    Args:
+        automation (BackstageAutomation): Automation instance shared by the worker threads
+        repo: GitHub repository object
+        onboarded (frozenset, optional): Names already known to be onboarded from get_onboarded_repo_names
+
+    Returns:
+        str: "processed", "skipped" or "failed"
+    """
+    try:
+        print(f"\nProcessing repository: {repo.name}")
+
+        # Skip if catalog-info.yaml already exists; the search index answers most
+        # repositories, and the root tree listing confirms the rest without
+        # downloading the file or raising on a miss
+        if repo.name in onboarded or "catalog-info.yaml" in automation.get_root_tree_paths(repo):
+            print(f"Skipping {repo.name}: catalog-info.yaml already exists")
+            return "skipped"
+    except Exception as repo_error:
+        print(f"Error processing repository {repo.name}: {str(repo_error)}")
+        return "failed"
+
+    return _onboard_repository(automation, repo.name)
+
 def main():
     """Main function to run the automation for all repositories in the organization."""
     # Configuration
@@ -793,10 +1305,12 @@ def main():
         raise ValueError("BACKSTAGE_URL environment variable is required")
 
     github_api_url = os.environ.get("GITHUB_API_URL")  # Optional
+    # Optional comma-separated extra tokens; requests rotate across all of them
+    github_tokens = [token.strip() for token in os.environ.get("GITHUB_TOKENS", "").split(",") if token.strip()]
     check_only = os.environ.get("CHECK_ONLY", "false").lower() == "true"
     canary_repo = os.environ.get("CANARY_REPO")  # Optional single repository for testing
 
-    automation = BackstageAutomation(github_token, org_name, github_api_url)
+    automation = BackstageAutomation(github_token, org_name, github_api_url, github_tokens)
     
     try:
         if check_only:
@@ -809,6 +1323,8 @@ def main():
 
         # Get repositories to process
         print(f"Fetching repositories from organization {org_name}...")
+        summaries = None
+        onboarded = frozenset()
         if canary_repo:
             print(f"Running in canary mode for repository: {canary_repo}")
             try:
@@ -817,49 +1333,52 @@ def main():
                 print(f"Error: Could not find repository {canary_repo}: {str(e)}")
                 return
         else:
-            repositories = automation.org.get_repos()
-        
-        processed = skipped = failed = 0
-        
-        for repo in repositories:
             try:
-                print(f"\nProcessing repository: {repo.name}")
-                
-                # Skip if catalog-info.yaml already exists in any branch
+                # One GraphQL request per 100 repositories also says which are onboarded
+                summaries = automation.get_org_repo_summaries()
+            except Exception as e:
+                print(f"GraphQL repository query failed, falling back to REST: {str(e)}")
+                repositories = automation._pipelined_pages(automation.org.get_repos())
                 try:
-                    repo.get_contents("catalog-info.yaml")
-                    print(f"Skipping {repo.name}: catalog-info.yaml already exists")
-                    skipped += 1
-                    continue
-                except Exception:
-                    pass  # File doesn't exist, continue with creation
-
-                # Create PR and Issue
-                pr, issue = automation.create_pr_and_issue(repo.name)
-                print(f"Created PR #{pr.number} for {repo.name}")
-                processed += 1
-
-            except Exception as repo_error:
-                print(f"Error processing repository {repo.name}: {str(repo_error)}")
-                failed += 1
-                continue
+                    # At most ten 100-result search pages instead of a probe per repository
+                    onboarded = automation.throttled(automation.get_onboarded_repo_names)
+                except Exception as search_error:
+                    print(f"Code search failed, checking every repository: {str(search_error)}")
+
+        # Capped at 8 workers to stay within GitHub's secondary rate limits
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            if summaries is not None:
+                pending = []
+                for summary in summaries:
+                    if summary["has_catalog"]:
+                        print(f"Skipping {summary['name']}: catalog-info.yaml already exists")
+                    else:
+                        pending.append(summary["name"])
+                outcomes = Counter(_bounded_map(
+                    executor, lambda name: automation.throttled(_onboard_repository, automation, name), pending
+                ))
+                outcomes["skipped"] = len(summaries) - len(pending)
+            else:
+                outcomes = Counter(_bounded_map(
+                    executor, lambda repo: automation.throttled(_process_repository, automation, repo, onboarded), repositories
+                ))
+        processed, skipped, failed = outcomes["processed"], outcomes["skipped"], outcomes["failed"]
 
         # Generate summary
-        summary = [
-            f"## Automation Summary ({datetime.now().strftime('%Y-%m-%d %H:%M UTC')})",
-            "### Mode: {}".format("Canary Test" if canary_repo else "Full Organization"),
-            f"- Repository: {canary_repo}" if canary_repo else f"- Organization: {org_name}",
-            f"- Processed: {processed} repositories",
-            f"- Skipped: {skipped} repositories (already onboarded)",
-            f"- Failed: {failed} repositories",
-        ]
-        
-        with open("automation_summary.txt", "w") as f:
-            f.write("\n".join(summary))
+        Path("automation_summary.txt").write_text(AUTOMATION_SUMMARY_TEMPLATE.format(
+            timestamp=datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC'),
+            mode="Canary Test" if canary_repo else "Full Organization",
+            target=f"Repository: {canary_repo}" if canary_repo else f"Organization: {org_name}",
+            processed=processed,
+            skipped=skipped,
+            failed=failed
+        ), encoding="utf-8")
 
     except Exception as e:
         print(f"Error occurred: {str(e)}")
         raise
+    finally:
+        automation.etag_cache.save()
 
 if __name__ == "__main__":
     main()
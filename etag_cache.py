@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Shared by every run for the current user, so unchanged resources are revalidated with a 304
+DEFAULT_CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "backstage-automation", "etags.json"
+)
+
+# World-readable location used by earlier versions; removed on the next save
+LEGACY_CACHE_PATH = os.path.expanduser("~/.cache/backstage-automation.json")
+
+# Total size of the cached response bodies; the least recently used are dropped first
+ETAG_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# GET endpoints that return file contents or whole trees. They are large, may hold
+# private source code, and BackstageAutomation already memoizes tree listings.
+UNCACHED_PATHS = ("/git/blobs/", "/git/trees/", "/contents/")
+
+# Headers of the original 200 response replayed on a 304; PyGithub reads pagination
+# and PaginatedList.totalCount from Link, which a 304 does not carry
+REPLAYED_HEADERS = ("link",)
+
+def _body_size(body: str) -> int:
+    """Size of a cached response body in bytes as stored on disk."""
+    return len(body.encode("utf-8"))
+
+class ConditionalRequestCache:
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, max_bytes: int = ETAG_CACHE_MAX_BYTES):
+        """Initialize a cache of GET responses revalidated with If-None-Match.
+
+        GitHub does not count 304 Not Modified responses against the rate limit,
+        so repeated reads of unchanged resources are free.
+
+        Args:
+            path (str, optional): JSON file the cache is loaded from and saved to; None keeps it in memory.
+                                  The file is only readable by the current user.
+            max_bytes (int, optional): Maximum total size of the cached response bodies
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # request key -> (etag, response body, replayed response headers)
+        self._entries: "OrderedDict[str, Tuple[str, str, Dict[str, str]]]" = OrderedDict()
+        self._size = 0
+        self._load()
+
+    def _load(self):
+        """Read a previously saved cache, ignoring a missing or unreadable file."""
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+            with self._lock:
+                for key, entry in entries.items():
+                    if len(entry) == 3:  # Entries saved without headers cannot be replayed
+                        self._store(key, *entry)
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def _store(self, key: str, etag: str, body: str, headers: Dict[str, str]):
+        """Add or refresh an entry and evict down to max_bytes. Caller must hold the lock."""
+        previous = self._entries.pop(key, None)
+        if previous:
+            self._size -= _body_size(previous[1])
+        size = _body_size(body)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (etag, body, headers)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self._size -= _body_size(evicted)
+
+    def save(self):
+        """Write the cache to disk atomically so concurrent runs never read a partial file."""
+        if not self.path:
+            return
+        with self._lock:
+            entries = dict(self._entries)
+        try:
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            # Responses describe private repositories, so keep the file to this user
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.chmod(tmp_path, 0o600)  # O_CREAT's mode does not apply to an existing file
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+            if os.path.exists(LEGACY_CACHE_PATH):
+                os.remove(LEGACY_CACHE_PATH)
+        except OSError as e:
+            print(f"Failed to save ETag cache: {str(e)}")
+
+    @staticmethod
+    def _key(url: str, parameters: Optional[Dict[str, Any]]) -> str:
+        """Identify a GET request by its URL and query parameters."""
+        return f"{url}?{json.dumps(parameters or {}, sort_keys=True)}"
+
+    def install(self, requester: Any):
+        """Route a PyGithub Requester's JSON GET requests through the cache.
+
+        Requester.requestJsonAndCheck and pagination both go through requestJson,
+        so overriding it on the instance covers every object sharing the requester.
+
+        Args:
+            requester: github.Requester.Requester used by the Github client
+        """
+        original = requester.requestJson
+
+        def requestJson(verb, url, parameters=None, headers=None, input=None, cnx=None):
+            if verb != "GET" or any(path in url for path in UNCACHED_PATHS):
+                return original(verb, url, parameters, headers, input, cnx)
+
+            key = self._key(url, parameters)
+            with self._lock:
+                cached = self._entries.get(key)
+            headers = dict(headers or {})
+            if cached:
+                headers["If-None-Match"] = cached[0]
+
+            status, response_headers, output = original(verb, url, parameters, headers, input, cnx)
+            if status == 304 and cached:
+                with self._lock:
+                    self._entries.move_to_end(key)
+                return 200, {**response_headers, **cached[2]}, cached[1]
+            if status == 200 and "etag" in response_headers:
+                body = output.decode("utf-8") if isinstance(output, bytes) else output
+                with self._lock:
+                    self._store(key, response_headers["etag"], body, {
+                        name: response_headers[name] for name in REPLAYED_HEADERS if name in response_headers
+                    })
+            return status, response_headers, output
+
+        requester.requestJson = requestJson
@@ -0,0 +1,207 @@
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Tuple
+from github import Auth
+
+# X-RateLimit-Resource of the REST budget tracked per token; search and GraphQL
+# responses report separate, much smaller or point-based budgets
+CORE_RESOURCE = "core"
+
+class RateLimiter:
+    def __init__(self, max_concurrent: int = 8, min_remaining: int = 50):
+        """Initialize a limiter shared by all outbound GitHub calls.
+
+        Args:
+            max_concurrent (int, optional): Maximum number of requests in flight at once
+            min_remaining (int, optional): Pause until the rate limit resets once
+                                           fewer than this many requests remain
+        """
+        self._semaphore = threading.Semaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+        self.min_remaining = min_remaining
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        self.wait()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._semaphore.release()
+        return False
+
+    def wait(self):
+        """Block while GitHub has asked clients to back off."""
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for the given number of seconds."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def observe_remaining(self, remaining: int, reset_epoch: float):
+        """Pause until the reset time when the remaining request budget is low.
+
+        Args:
+            remaining (int): Value of X-RateLimit-Remaining
+            reset_epoch (float): Value of X-RateLimit-Reset (Unix timestamp)
+        """
+        if 0 <= remaining < self.min_remaining and reset_epoch:
+            self.pause(max(0.0, reset_epoch - time.time()))
+
+    def observe_headers(self, headers: Mapping[str, str]):
+        """Update the limiter from GitHub response headers.
+
+        Honors Retry-After (secondary rate limits) and the core X-RateLimit-Remaining.
+        """
+        headers = {key.lower(): value for key, value in headers.items()}
+        try:
+            if "retry-after" in headers:
+                self.pause(int(headers["retry-after"]))
+            elif "x-ratelimit-remaining" in headers and headers.get("x-ratelimit-resource") == CORE_RESOURCE:
+                self.observe_remaining(
+                    int(headers["x-ratelimit-remaining"]),
+                    float(headers.get("x-ratelimit-reset", 0))
+                )
+        except ValueError:
+            pass  # Ignore malformed headers
+
+class TokenPool:
+    def __init__(self, tokens: List[str], min_remaining: int = 100):
+        """Initialize a round-robin pool of GitHub tokens.
+
+        Args:
+            tokens (List[str]): GitHub tokens to rotate through
+            min_remaining (int, optional): Skip a token until its reset time once
+                                           fewer than this many requests remain
+        """
+        if not tokens:
+            raise ValueError("At least one GitHub token is required")
+        self.tokens = list(dict.fromkeys(tokens))  # Drop duplicates, keep order
+        self.min_remaining = min_remaining
+        self._lock = threading.Lock()
+        self._cycle = itertools.cycle(self.tokens)
+        # token -> (remaining, reset epoch); unknown tokens are assumed usable
+        self._limits: Dict[str, Tuple[int, float]] = {}
+
+    def _usable(self, token: str, now: float) -> bool:
+        """Whether a token has budget left or its window has reset. Caller must hold the lock."""
+        remaining, reset_epoch = self._limits.get(token, (self.min_remaining, 0.0))
+        return remaining >= self.min_remaining or reset_epoch <= now
+
+    def next_token(self) -> str:
+        """Return the next token with budget left, or the one that resets soonest."""
+        with self._lock:
+            now = time.time()
+            for _ in range(len(self.tokens)):
+                token = next(self._cycle)
+                if self._usable(token, now):
+                    return token
+            return min(self.tokens, key=lambda t: self._limits[t][1])
+
+    def record(self, token: str, remaining: int, reset_epoch: float):
+        """Store the rate-limit state last reported for a token."""
+        if remaining < 0:
+            return  # Nothing reported yet
+        with self._lock:
+            self._limits[token] = (remaining, reset_epoch)
+
+    def observe(self, token: str, headers: Mapping[str, str]) -> bool:
+        """Record a token's core REST budget from the headers of a response it was sent with.
+
+        Args:
+            token (str): Token the request was authenticated with
+            headers (Mapping[str, str]): Response headers with lower-case names
+
+        Returns:
+            bool: True if the headers reported the core budget
+        """
+        if headers.get("x-ratelimit-resource") != CORE_RESOURCE:
+            return False
+        try:
+            self.record(token, int(headers["x-ratelimit-remaining"]), float(headers.get("x-ratelimit-reset", 0)))
+        except (KeyError, ValueError):
+            return False
+        return True
+
+    def seconds_until_available(self) -> float:
+        """Seconds until some token has budget again (0 if one already does)."""
+        with self._lock:
+            now = time.time()
+            if any(self._usable(token, now) for token in self.tokens):
+                return 0.0
+            return min(reset for _, reset in self._limits.values()) - now
+
+class PooledTokenAuth(Auth.Auth):
+    def __init__(self, pool: TokenPool):
+        """PyGithub authentication that draws a token from a TokenPool for every request.
+
+        Args:
+            pool (TokenPool): Pool to draw tokens from
+        """
+        self.pool = pool
+        self._local = threading.local()
+
+    @property
+    def token_type(self) -> str:
+        return "token"
+
+    @property
+    def token(self) -> str:
+        token = self.pool.next_token()
+        self._local.last_token = token
+        return token
+
+    @property
+    def last_token(self) -> str:
+        """Token used by the most recent request made on the calling thread."""
+        return getattr(self._local, "last_token", self.pool.tokens[0])
+
+def retry_rate_limited(requester: Any, auth: PooledTokenAuth, limiter: RateLimiter):
+    """Track per-token budgets and retry rate-limited PyGithub requests on another token.
+
+    Every response's core budget is recorded against the token it was sent with;
+    once no token has budget left, the limiter pauses until the earliest reset.
+    A request rejected for rate limiting was never executed, so it is safe to
+    send again. Search limits are per token too, so another token is tried
+    first and the last one waits for its own reset.
+
+    Args:
+        requester: github.Requester.Requester used by the Github client
+        auth (PooledTokenAuth): Authentication drawing from the token pool
+        limiter (RateLimiter): Limiter paused alongside the retry so other threads back off too
+    """
+    original = requester.requestJson
+
+    def requestJson(verb, url, parameters=None, headers=None, input=None, cnx=None):
+        # One attempt per token, plus one after waiting for the earliest reset
+        for attempt in range(len(auth.pool.tokens) + 1):
+            status, response_headers, output = original(verb, url, parameters, dict(headers or {}), input, cnx)
+            core = auth.pool.observe(auth.last_token, response_headers)
+            if status not in (403, 429) or attempt == len(auth.pool.tokens):
+                break
+            if "retry-after" in response_headers:  # Secondary rate limit
+                wait = float(response_headers["retry-after"])
+                limiter.pause(wait)
+            elif response_headers.get("x-ratelimit-remaining") == "0":  # Primary rate limit
+                if core:
+                    wait = auth.pool.seconds_until_available()
+                    limiter.pause(wait)
+                elif attempt < len(auth.pool.tokens) - 1:
+                    wait = 0.0  # Another token has its own search budget
+                else:
+                    # Only this caller waits; other requests draw on other budgets
+                    wait = float(response_headers.get("x-ratelimit-reset", 0)) - time.time()
+            else:
+                break  # Permission error, not a rate limit
+            if wait > 0:
+                time.sleep(wait)
+        pause = auth.pool.seconds_until_available()
+        if pause > 0:
+            limiter.pause(pause)
+        return status, response_headers, output
+
+    requester.requestJson = requestJson
@@ -1,18 +1,124 @@
 import os
+import copy
 import json
-from base64 import b64encode, b64decode
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+import mmap
+import hashlib
+import functools
+import threading
+from typing import Any, Dict, Literal, Optional, Tuple, Union, overload
+from base64 import b64encode, b64decode, urlsafe_b64encode, urlsafe_b64decode
+
+# cryptography is imported where it is first needed. Listing organizations reads
+# the plaintext name index, so it only loads OpenSSL bindings when that index is
+# missing and has to be rebuilt from the bundle
+
+# Prefer orjson when installed; it serializes straight to bytes
+try:
+    import orjson
+
+    def _dumps(value: dict) -> bytes:
+        return orjson.dumps(value)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(value: dict) -> bytes:
+        return json.dumps(value).encode()
+
+    _loads = json.loads
+
+# PBKDF2-HMAC-SHA256 work factor for passphrase-derived keys (OWASP 2023 guidance)
+PBKDF2_ITERATIONS = 600_000
+
+# File in the storage directory holding the random salt for passphrase-derived keys
+SALT_FILE = ".salt"
+
+# Single encrypted file holding every organization's configuration; earlier
+# versions wrote one <org>.enc file each, which are migrated into it on first use
+BUNDLE_FILE = "organizations.bundle"
+
+# Plain JSON list of the organization names in the bundle, so they can be listed
+# without the key; names are not secret, their tokens are
+INDEX_FILE = "organizations.index"
+
+# Where a bundle that cannot be decrypted is moved before a new one is written
+UNREADABLE_BUNDLE_FILE = "organizations.bundle.unreadable"
+
+@functools.lru_cache(maxsize=8)
+def _derive_key(passphrase: bytes, salt: bytes, iterations: int) -> bytes:
+    """Derive a Fernet key from a passphrase, once per process for each input."""
+    # cryptography runs PBKDF2 inside OpenSSL, which uses the CPU's SHA
+    # extensions (SHA-NI, ARMv8 crypto) where available; no backend argument
+    # is needed since cryptography 3.1. A 32-byte key is a single SHA-256
+    # block, so there are no independent blocks to derive in parallel.
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=iterations)
+    return urlsafe_b64encode(kdf.derive(passphrase))
+
+def derive_key_from_passphrase(passphrase: str, salt: bytes) -> bytes:
+    """Derive the Fernet key SecureStorage uses for a passphrase.
+
+    Args:
+        passphrase (str): Value of BACKSTAGE_ENCRYPTION_PASSPHRASE
+        salt (bytes): Salt stored alongside the encrypted configurations
+
+    Returns:
+        bytes: URL-safe base64 encoded 32-byte key
+    """
+    return _derive_key(passphrase.encode(), salt, PBKDF2_ITERATIONS)
+
+# Ciphers shared by every SecureStorage using the same key and algorithm,
+# keyed by key fingerprint and algorithm name
+_CIPHER_CACHE: Dict[Tuple[bytes, str], Any] = {}
+
+# Supported values of SecureStorage's aead argument
+AEAD_ALGORITHMS = ("fernet", "chacha20")
+
+# ChaCha20-Poly1305 nonce size in bytes; a fresh random nonce prefixes every token
+CHACHA20_NONCE_SIZE = 12
+
+def _key_fingerprint(key: bytes) -> bytes:
+    """Short, non-reversible identifier of an encryption key."""
+    return hashlib.blake2b(key, digest_size=8).digest()
+
+def _build_cipher(key: bytes, aead: str) -> Any:
+    """Build the cipher for a Fernet-format key."""
+    if aead == "chacha20":
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+        from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+
+        # Derive a separate 256-bit key so Fernet and ChaCha20 never share key material
+        hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=b"backstage-storage chacha20-poly1305")
+        return ChaCha20Poly1305(hkdf.derive(urlsafe_b64decode(key)))
+    from cryptography.fernet import Fernet
+
+    return Fernet(key)
+
+def _cipher(key: bytes, aead: str = "fernet") -> Any:
+    """Return the shared cipher for a key, building it on first use."""
+    cache_key = (_key_fingerprint(key), aead)
+    cipher = _CIPHER_CACHE.get(cache_key)
+    if cipher is None:
+        # setdefault keeps a single instance if two threads race here
+        cipher = _CIPHER_CACHE.setdefault(cache_key, _build_cipher(key, aead))
+    return cipher
 
 class SecureStorage:
-    def __init__(self, storage_path: str = None):
+    def __init__(self, storage_path: str = None, aead: str = "fernet"):
         """Initialize secure storage with encryption.
         
         Args:
             storage_path (str, optional): Path to storage directory. If not provided,
                                         uses 'secure_storage' in current directory.
+            aead (str, optional): "fernet" (AES-128-CBC + HMAC-SHA256) or "chacha20"
+                                  (ChaCha20-Poly1305, single pass and faster without AES-NI).
+                                  Files written with one cannot be read with the other.
         """
+        if aead not in AEAD_ALGORITHMS:
+            raise ValueError(f"Unsupported aead {aead!r}; expected one of {', '.join(AEAD_ALGORITHMS)}")
+        self.aead = aead
         if storage_path is None:
             # Use directory relative to the script location
             script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,45 +128,221 @@ class SecureStorage:
             
         if not os.path.exists(self.storage_path):
             os.makedirs(self.storage_path)
+        # storage_path is absolute and fixed, so file paths are plain concatenation
+        self._path_prefix = os.path.join(self.storage_path, "")
         
-        # Get encryption key from environment or generate new one
+        # Get encryption key from environment, derive it from a passphrase, or generate new one
         self.key = os.environ.get('BACKSTAGE_ENCRYPTION_KEY', '').encode()
+        passphrase = os.environ.get('BACKSTAGE_ENCRYPTION_PASSPHRASE', '')
+        if not self.key and passphrase:
+            self.key = derive_key_from_passphrase(passphrase, self._load_salt())
         if not self.key:
             print("Warning: BACKSTAGE_ENCRYPTION_KEY not found in environment. Generating new key...")
-            self.key = Fernet.generate_key()
+            # Same format as Fernet.generate_key()
+            self.key = urlsafe_b64encode(os.urandom(32))
             print("Please set the following key in your environment:")
             print(f"BACKSTAGE_ENCRYPTION_KEY={self.key.decode()}")
         
-        self.cipher = Fernet(self.key)
-    
-    def encrypt(self, data: str) -> bytes:
-        """Encrypt string data."""
-        return self.cipher.encrypt(data.encode())
+        self._cipher = None
+        # Every organization's configuration lives in one encrypted bundle;
+        # ((mtime_ns, size), configurations) from the last time it was read
+        self._bundle_cache = None
+        self._migrated = False
+        # Set when the bundle on disk could not be decrypted with this key
+        self._bundle_unreadable = False
+        # (directory mtime_ns, organization names) from the last list_organizations scan
+        self._orgs_cache = None
+        # Saves rewrite the whole bundle, so concurrent sessions must not interleave
+        self._lock = threading.Lock()
+
+    @property
+    def cipher(self) -> Any:
+        """Cipher for this storage's key, built on first encryption or decryption."""
+        if self._cipher is None:
+            self._cipher = _cipher(self.key, self.aead)
+        return self._cipher
+
+    def _load_salt(self) -> bytes:
+        """Read the salt for passphrase-derived keys, creating it on first use."""
+        salt_path = os.path.join(self.storage_path, SALT_FILE)
+        if os.path.exists(salt_path):
+            with open(salt_path, "rb") as f:
+                return f.read()
+        salt = os.urandom(16)
+        with open(salt_path, "wb") as f:
+            f.write(salt)
+        return salt
     
-    def decrypt(self, encrypted_data: bytes) -> str:
-        """Decrypt bytes to string."""
-        return self.cipher.decrypt(encrypted_data).decode()
+    def _seal(self, data: bytes, context: Optional[bytes] = None) -> bytes:
+        """Encrypt bytes; with ChaCha20-Poly1305 the context is authenticated as associated data."""
+        if self.aead == "chacha20":
+            nonce = os.urandom(CHACHA20_NONCE_SIZE)
+            return nonce + self.cipher.encrypt(nonce, data, context)
+        return self.cipher.encrypt(data)
+
+    def _unseal(self, token: bytes, context: Optional[bytes] = None) -> bytes:
+        """Decrypt bytes produced by _seal with the same context."""
+        if self.aead == "chacha20":
+            return self.cipher.decrypt(token[:CHACHA20_NONCE_SIZE], token[CHACHA20_NONCE_SIZE:], context)
+        return self.cipher.decrypt(token)
+
+    def _read_sealed(self, file_path: str, context: bytes) -> bytes:
+        """Read and decrypt a file written with _seal."""
+        with open(file_path, "rb") as f:
+            if self.aead == "chacha20" and os.fstat(f.fileno()).st_size:
+                # ChaCha20-Poly1305 decrypts straight from the mapped pages, so a large
+                # bundle is never copied into a bytes object first
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as token:
+                    return self._unseal(token, context)
+            # Fernet base64-decodes its token into a new buffer anyway, so a plain read is no worse
+            return self._unseal(f.read(), context)
+
+    def encrypt(self, data: Union[str, bytes]) -> bytes:
+        """Encrypt string or bytes data; bytes are used as-is without a UTF-8 round-trip."""
+        return self._seal(data if isinstance(data, bytes) else data.encode())
+
+    @overload
+    def decrypt(self, encrypted_data: bytes, raw: Literal[False] = ...) -> str: ...
+
+    @overload
+    def decrypt(self, encrypted_data: bytes, raw: Literal[True]) -> bytes: ...
+
+    def decrypt(self, encrypted_data: bytes, raw: bool = False) -> Union[str, bytes]:
+        """Decrypt bytes to string, or to bytes when raw is True."""
+        plaintext = self._unseal(encrypted_data)
+        return plaintext if raw else plaintext.decode()
     
+    def _configs(self) -> Dict[str, dict]:
+        """Return every organization's configuration from the bundle. Caller must hold the lock.
+
+        The decrypted bundle is reused until the file changes on disk. A bundle
+        that cannot be decrypted, e.g. after the key changed, reads as empty.
+        """
+        if not self._migrated:
+            self._migrated = True
+            self._migrate_org_files()
+        file_path = self._path_prefix + BUNDLE_FILE
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return {}
+        version = (stat.st_mtime_ns, stat.st_size)
+        if self._bundle_cache is None or self._bundle_cache[0] != version:
+            try:
+                configs = _loads(self._read_sealed(file_path, BUNDLE_FILE.encode()))
+                self._bundle_unreadable = False
+            except Exception as e:
+                print(f"Failed to decrypt {BUNDLE_FILE}; check BACKSTAGE_ENCRYPTION_KEY: {type(e).__name__}")
+                configs = {}
+                self._bundle_unreadable = True
+            self._bundle_cache = (version, configs)
+        return self._bundle_cache[1]
+
+    def _write_configs(self, configs: Dict[str, dict]):
+        """Encrypt and atomically replace the bundle and its name index. Caller must hold the lock."""
+        file_path = self._path_prefix + BUNDLE_FILE
+        if self._bundle_unreadable:
+            # Keep the old bundle for recovery with the right key instead of overwriting it
+            os.replace(file_path, self._path_prefix + UNREADABLE_BUNDLE_FILE)
+            print(f"Moved undecryptable {BUNDLE_FILE} to {UNREADABLE_BUNDLE_FILE}")
+            self._bundle_unreadable = False
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self._seal(_dumps(configs), BUNDLE_FILE.encode()))
+        os.replace(tmp_path, file_path)
+        stat = os.stat(file_path)
+        self._bundle_cache = ((stat.st_mtime_ns, stat.st_size), configs)
+        self._write_index(list(configs))
+
+    def _write_index(self, orgs: list):
+        """Atomically replace the plaintext list of organization names."""
+        index_path = self._path_prefix + INDEX_FILE
+        with open(f"{index_path}.tmp", "w") as f:
+            json.dump(orgs, f)
+        os.replace(f"{index_path}.tmp", index_path)
+
+    def _migrate_org_files(self):
+        """Move configurations saved as one .enc file per organization into the bundle."""
+        with os.scandir(self.storage_path) as entries:
+            legacy = [entry.name for entry in entries if entry.name.endswith(".enc")]
+        if not legacy:
+            return
+        configs = dict(self._configs())
+        migrated = []
+        for file_name in legacy:
+            org_name = file_name[:-4]  # Remove .enc extension
+            try:
+                config = _loads(self._read_sealed(self._path_prefix + file_name, org_name.encode()))
+            except Exception as e:
+                print(f"Failed to migrate configuration for {org_name}: {str(e)}")
+                continue
+            # An entry already in the bundle was saved after the per-organization file
+            configs.setdefault(org_name, config)
+            migrated.append(file_name)
+        if not migrated:
+            return
+        self._write_configs(configs)
+        for file_name in migrated:
+            os.remove(self._path_prefix + file_name)
+
     def save_org_config(self, org_name: str, config: dict):
         """Save encrypted organization configuration."""
-        encrypted_data = self.encrypt(json.dumps(config))
-        file_path = os.path.join(self.storage_path, f"{org_name}.enc")
-        with open(file_path, "wb") as f:
-            f.write(encrypted_data)
+        with self._lock:
+            configs = dict(self._configs())
+            configs[org_name] = copy.deepcopy(config)
+            self._write_configs(configs)
     
     def load_org_config(self, org_name: str) -> dict:
         """Load and decrypt organization configuration."""
-        file_path = os.path.join(self.storage_path, f"{org_name}.enc")
-        if not os.path.exists(file_path):
-            return None
-        with open(file_path, "rb") as f:
-            encrypted_data = f.read()
-        return json.loads(self.decrypt(encrypted_data))
+        with self._lock:
+            return copy.deepcopy(self._configs().get(org_name))
     
+    def save_all_org_configs(self, configs: Dict[str, dict]):
+        """Save many organization configurations with a single encryption and write.
+
+        Every organization shares one encrypted bundle, so the per-token overhead
+        (nonce or IV, authentication tag) is paid once rather than per organization.
+
+        Args:
+            configs (Dict[str, dict]): Organization name mapped to its configuration
+        """
+        with self._lock:
+            merged = dict(self._configs())
+            merged.update(copy.deepcopy(configs))
+            self._write_configs(merged)
+
+    def load_all_org_configs(self) -> Dict[str, dict]:
+        """Load every saved organization configuration, or an empty dict if there is none."""
+        with self._lock:
+            return copy.deepcopy(self._configs())
+
+    def _rebuild_index(self) -> list:
+        """Recreate a missing or damaged name index from the bundle, which needs the key."""
+        if not os.path.exists(self._path_prefix + BUNDLE_FILE):
+            return []
+        with self._lock:
+            configs = self._configs()
+            if self._bundle_unreadable:
+                return []
+            self._write_index(list(configs))
+            return list(configs)
+
     def list_organizations(self) -> list:
-        """List all saved organizations."""
-        orgs = []
-        for file in os.listdir(self.storage_path):
-            if file.endswith(".enc"):
-                orgs.append(file[:-4])  # Remove .enc extension
-        return orgs
+        """List all saved organizations without decrypting anything.
+
+        Names come from the bundle's plaintext index and from per-organization
+        files not yet migrated. The scan is reused until the directory's mtime
+        changes, which happens whenever either is added, replaced or removed.
+        """
+        mtime_ns = os.stat(self.storage_path).st_mtime_ns
+        if self._orgs_cache is None or self._orgs_cache[0] != mtime_ns:
+            try:
+                with open(self._path_prefix + INDEX_FILE) as f:
+                    orgs = json.load(f)
+            except (OSError, ValueError):
+                orgs = self._rebuild_index()
+            with os.scandir(self.storage_path) as entries:
+                legacy = [entry.name[:-4] for entry in entries if entry.name.endswith(".enc")]  # Remove .enc extension
+            orgs = list(dict.fromkeys(orgs + legacy))
+            self._orgs_cache = (mtime_ns, orgs)
+        return list(self._orgs_cache[1])
@@ -0,0 +1,201 @@
+import hashlib
+import hmac
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from backstage_automation import BACKSTAGE_BRANCH_PREFIX
+
+CATALOG_FILE = "catalog-info.yaml"
+
+# GitHub caps webhook payloads at 25 MB; anything larger is not a GitHub delivery
+MAX_PAYLOAD_BYTES = 25 * 1024 * 1024
+
+class RepoStatusStore:
+    def __init__(self):
+        """Initialize an in-memory, thread-safe store of dashboard status rows per organization."""
+        self._lock = threading.Lock()
+        self._orgs: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self._versions: Dict[str, int] = {}
+
+    def version(self, org_name: str) -> int:
+        """Return a counter that changes whenever an organization's rows change."""
+        with self._lock:
+            return self._versions.get(org_name, 0)
+
+    def _bump(self, org_name: str):
+        """Record a change to an organization's rows. Caller must hold the lock."""
+        self._versions[org_name] = self._versions.get(org_name, 0) + 1
+
+    def get(self, org_name: str) -> Optional[List[Dict[str, str]]]:
+        """Return the status rows for an organization, or None if it was never seeded."""
+        with self._lock:
+            repos = self._orgs.get(org_name)
+            if repos is None:
+                return None
+            return [dict(row) for row in repos.values()]
+
+    def seed(self, org_name: str, rows: List[Dict[str, str]]):
+        """Replace an organization's rows, e.g. after a full REST or GraphQL fetch."""
+        with self._lock:
+            self._orgs[org_name] = {row["Repository"]: dict(row) for row in rows}
+            self._bump(org_name)
+
+    def forget(self, org_name: str):
+        """Drop an organization so the next read falls back to a full fetch."""
+        with self._lock:
+            self._orgs.pop(org_name, None)
+            self._bump(org_name)
+
+    def apply_event(self, event: str, payload: Dict[str, Any]):
+        """Update the stored rows from a GitHub webhook event.
+
+        Args:
+            event (str): Value of the X-GitHub-Event header
+            payload (Dict[str, Any]): Decoded webhook payload
+        """
+        repository = payload.get("repository") or {}
+        org_name = (payload.get("organization") or {}).get("login") \
+            or (repository.get("owner") or {}).get("login")
+        repo_name = repository.get("name")
+        if not org_name or not repo_name:
+            return
+
+        with self._lock:
+            repos = self._orgs.get(org_name)
+            if repos is None:
+                return  # Not seeded yet; the next full fetch will include this change
+            self._bump(org_name)
+
+            if event == "repository":
+                self._apply_repository_event(repos, repo_name, payload)
+                return
+
+            row = repos.setdefault(repo_name, self._new_row(repo_name, repository))
+            row["Last Updated"] = datetime.utcnow().strftime("%Y-%m-%d")
+            if event == "push":
+                self._apply_push_event(row, repository, payload)
+            elif event == "pull_request":
+                self._apply_pull_request_event(row, payload)
+
+    @staticmethod
+    def _new_row(repo_name: str, repository: Dict[str, Any]) -> Dict[str, str]:
+        """Build the row for a repository first seen through a webhook."""
+        return {
+            "Repository": repo_name,
+            "Language": repository.get("language") or "Unknown",
+            "Status": "Not Onboarded",
+            "Has catalog-info.yaml": "No",
+            "PR Status": "N/A",
+            "Last Updated": datetime.utcnow().strftime("%Y-%m-%d")
+        }
+
+    def _apply_repository_event(self, repos: Dict[str, Dict[str, str]], repo_name: str, payload: Dict[str, Any]):
+        """Handle repository created, deleted and renamed events."""
+        action = payload.get("action")
+        if action == "created":
+            repos.setdefault(repo_name, self._new_row(repo_name, payload["repository"]))
+        elif action == "deleted":
+            repos.pop(repo_name, None)
+        elif action == "renamed":
+            old_name = payload.get("changes", {}).get("repository", {}).get("name", {}).get("from")
+            row = repos.pop(old_name, None) or self._new_row(repo_name, payload["repository"])
+            row["Repository"] = repo_name
+            repos[repo_name] = row
+
+    @staticmethod
+    def _apply_push_event(row: Dict[str, str], repository: Dict[str, Any], payload: Dict[str, Any]):
+        """Track catalog-info.yaml being added or removed on the default branch."""
+        # Only pushes to the default branch change onboarding status
+        if payload.get("ref") != f"refs/heads/{repository.get('default_branch')}":
+            return
+        for commit in payload.get("commits", []):
+            if CATALOG_FILE in commit.get("added", []) or CATALOG_FILE in commit.get("modified", []):
+                row["Has catalog-info.yaml"] = "Yes"
+            elif CATALOG_FILE in commit.get("removed", []):
+                row["Has catalog-info.yaml"] = "No"
+        if row["PR Status"] == "N/A":
+            row["Status"] = "Onboarded" if row["Has catalog-info.yaml"] == "Yes" else "Not Onboarded"
+
+    @staticmethod
+    def _apply_pull_request_event(row: Dict[str, str], payload: Dict[str, Any]):
+        """Track Backstage integration PRs being opened, closed or merged."""
+        pr = payload.get("pull_request") or {}
+        if not (pr.get("head") or {}).get("ref", "").startswith(BACKSTAGE_BRANCH_PREFIX):
+            return
+        action = payload.get("action")
+        if action in ("opened", "reopened"):
+            row["Status"] = "In Progress"
+            row["PR Status"] = f"PR #{pr['number']} Open"
+        elif action == "closed":
+            row["PR Status"] = "Merged" if pr.get("merged") else "N/A"
+            if pr.get("merged"):
+                row["Has catalog-info.yaml"] = "Yes"
+            row["Status"] = "Onboarded" if row["Has catalog-info.yaml"] == "Yes" else "Not Onboarded"
+
+def verify_signature(secret: str, body: bytes, signature: str) -> bool:
+    """Check an X-Hub-Signature-256 header against the request body.
+
+    Args:
+        secret (str): Webhook secret configured on GitHub
+        body (bytes): Raw request body
+        signature (str): Header value in the form "sha256=<hexdigest>"
+
+    Returns:
+        bool: True if the signature matches
+    """
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature or "")
+
+def start_webhook_server(store: RepoStatusStore, secret: str, host: str = "0.0.0.0", port: int = 8765) -> ThreadingHTTPServer:
+    """Serve POST /webhook on a background thread and feed events into the store.
+
+    Args:
+        store (RepoStatusStore): Store updated on every verified event
+        secret (str): Webhook secret used to verify X-Hub-Signature-256
+        host (str, optional): Interface to bind
+        port (int, optional): Port to listen on
+
+    Returns:
+        ThreadingHTTPServer: The running server
+    """
+    class WebhookHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/webhook":
+                self.send_response(404)
+                self.end_headers()
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+            except ValueError:
+                length = -1
+            if length < 0:
+                self.send_response(400)
+                self.end_headers()
+                return
+            if length > MAX_PAYLOAD_BYTES:
+                self.send_response(413)
+                self.end_headers()
+                return
+            body = self.rfile.read(length)
+            if not verify_signature(secret, body, self.headers.get("X-Hub-Signature-256")):
+                self.send_response(401)
+                self.end_headers()
+                return
+            try:
+                store.apply_event(self.headers.get("X-GitHub-Event", ""), json.loads(body))
+            except Exception as e:
+                print(f"Failed to handle webhook event: {str(e)}")
+                self.send_response(400)
+                self.end_headers()
+                return
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass  # Keep the Streamlit console quiet
+
+    server = ThreadingHTTPServer((host, port), WebhookHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server